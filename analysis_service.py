@@ -4,9 +4,10 @@ Call Graph Analysis Service
 Pure call graph analysis functionality without LLM, Git or Docker dependencies.
 """
 
+import asyncio
 import logging
 import traceback
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 from .call_graph_analyzer import CallGraphAnalyzer
@@ -17,6 +18,10 @@ from .utils.patterns import CODE_EXTENSIONS
 
 logger = logging.getLogger(__name__)
 
+# Languages with a call graph analyzer, in the order they are reported.
+_SUPPORTED_LANGUAGES = ("python", "javascript", "typescript", "java", "csharp", "c", "cpp", "php")
+_SUPPORTED_LANGUAGE_SET = frozenset(_SUPPORTED_LANGUAGES)
+
 
 class CallGraphAnalysisService:
     """
@@ -28,9 +33,17 @@ class CallGraphAnalysisService:
     3. Result consolidation
     """
 
-    def __init__(self):
-        """Initialize the analysis service with language-specific analyzers."""
-        self.call_graph_analyzer = CallGraphAnalyzer()
+    def __init__(self, max_workers: Optional[int] = 1, cache_dir: Optional[str] = None):
+        """
+        Initialize the analysis service with language-specific analyzers.
+
+        Args:
+            max_workers: Number of worker processes used to analyze files;
+                1 (the default) analyzes them in this process, None uses every CPU
+            cache_dir: Directory of the persistent per-file result cache,
+                or None to disable caching
+        """
+        self.call_graph_analyzer = CallGraphAnalyzer(max_workers=max_workers, cache_dir=cache_dir)
 
     def analyze_repository(
         self,
@@ -58,32 +71,82 @@ class CallGraphAnalysisService:
 
             logger.debug("Starting call graph analysis...")
             call_graph_result = self._analyze_call_graph(structure_result["file_tree"], repo_path)
-            logger.debug(
-                f"Call graph analysis complete. Found {call_graph_result['call_graph']['total_functions']} functions."
-            )
+            return self._build_analysis_result(structure_result, call_graph_result)
 
-            result = {
-                "functions": call_graph_result["functions"],
-                "relationships": call_graph_result["relationships"],
-                "file_tree": structure_result["file_tree"],
-                "summary": {
-                    **structure_result["summary"],
-                    **call_graph_result["call_graph"],
-                    "analysis_type": "full",
-                    "languages_analyzed": call_graph_result["call_graph"]["languages_found"],
-                },
-                "visualization": call_graph_result["visualization"],
-            }
+        except Exception as e:
+            logger.error(f"Analysis failed: {str(e)}", exc_info=True)
+            raise RuntimeError(f"Repository analysis failed: {str(e)}")
 
-            logger.debug(
-                f"Analysis completed: {result['summary']['total_functions']} functions found"
+    async def analyze_repository_async(
+        self,
+        repo_path: str,
+        include_patterns: Optional[List[str]] = None,
+        exclude_patterns: Optional[List[str]] = None,
+        batch_size: int = 64,
+    ) -> Dict[str, any]:
+        """
+        Async variant of analyze_repository that reads and parses files on worker threads.
+
+        Files are read and parsed in concurrent batches with asyncio.to_thread so
+        that disk latency overlaps with parsing, which helps most on cold caches
+        and network filesystems.
+
+        Args:
+            repo_path: Local repository path to analyze
+            include_patterns: File patterns to include (e.g., ['*.py', '*.js'])
+            exclude_patterns: Additional patterns to exclude
+            batch_size: Number of files read and parsed concurrently
+
+        Returns:
+            Dict with analysis results, as returned by analyze_repository
+        """
+        try:
+            logger.debug(f"Starting async analysis of {repo_path}")
+
+            structure_result = await asyncio.to_thread(
+                self._analyze_structure, repo_path, include_patterns, exclude_patterns
             )
-            return result
+            logger.debug(f"Found {structure_result['summary']['total_files']} files to analyze.")
+
+            supported_files, unsupported_count = self._collect_supported_files(
+                structure_result["file_tree"]
+            )
+            call_graph_result = await self.call_graph_analyzer.analyze_code_files_async(
+                supported_files, repo_path, batch_size=batch_size
+            )
+            self._add_language_summary(call_graph_result, unsupported_count)
+            return self._build_analysis_result(structure_result, call_graph_result)
 
         except Exception as e:
             logger.error(f"Analysis failed: {str(e)}", exc_info=True)
             raise RuntimeError(f"Repository analysis failed: {str(e)}")
 
+    def _build_analysis_result(
+        self, structure_result: Dict[str, any], call_graph_result: Dict[str, any]
+    ) -> Dict[str, any]:
+        """Combine the structure and call graph analyses into the final result."""
+        logger.debug(
+            f"Call graph analysis complete. Found {call_graph_result['call_graph']['total_functions']} functions."
+        )
+
+        result = {
+            "functions": call_graph_result["functions"],
+            "relationships": call_graph_result["relationships"],
+            "file_tree": structure_result["file_tree"],
+            "summary": {
+                **structure_result["summary"],
+                **call_graph_result["call_graph"],
+                "analysis_type": "full",
+                "languages_analyzed": call_graph_result["call_graph"]["languages_found"],
+            },
+            "visualization": call_graph_result["visualization"],
+        }
+
+        logger.debug(
+            f"Analysis completed: {result['summary']['total_functions']} functions found"
+        )
+        return result
+
     def analyze_repository_structure_only(
         self,
         repo_path: str,
@@ -141,43 +204,43 @@ class CallGraphAnalysisService:
         """
         Perform multi-language call graph analysis.
         """
+        supported_files, unsupported_count = self._collect_supported_files(file_tree)
+        result = self.call_graph_analyzer.analyze_code_files(supported_files, repo_dir)
+        self._add_language_summary(result, unsupported_count)
+        return result
+
+    def _collect_supported_files(self, file_tree: Dict[str, any]) -> Tuple[List[Dict], int]:
+        """
+        Get the code files of supported languages from the file tree.
+
+        Returns:
+            Tuple of (supported code files, number of unsupported code files)
+        """
         logger.debug("Extracting code files from file tree...")
         code_files = self.call_graph_analyzer.extract_code_files(file_tree)
 
         logger.debug(f"Found {len(code_files)} total code files. Filtering for supported languages.")
         supported_files = self._filter_supported_languages(code_files)
         logger.debug(f"Analyzing {len(supported_files)} supported files.")
+        return supported_files, len(code_files) - len(supported_files)
 
-        result = self.call_graph_analyzer.analyze_code_files(supported_files, repo_dir)
-
+    def _add_language_summary(self, result: Dict[str, any], unsupported_count: int) -> None:
+        """Record the supported languages and unsupported file count in a call graph result."""
         result["call_graph"]["supported_languages"] = self._get_supported_languages()
-        result["call_graph"]["unsupported_files"] = len(code_files) - len(supported_files)
-
-        return result
+        result["call_graph"]["unsupported_files"] = unsupported_count
 
     def _filter_supported_languages(self, code_files: List[Dict]) -> List[Dict]:
         """
         Filter code files to only include supported languages.
 
-        Supports Python, JavaScript, TypeScript, Java, C#, C, C++, PHP, Go, and Rust.
+        Supports Python, JavaScript, TypeScript, Java, C#, C, C++ and PHP.
         """
-        supported_languages = {
-            "python",
-            "javascript",
-            "typescript",
-            "java",
-            "csharp",
-            "c",
-            "cpp",
-            "php",
-        }
-
         return [
             file_info
             for file_info in code_files
-            if file_info.get("language") in supported_languages
+            if file_info.get("language") in _SUPPORTED_LANGUAGE_SET
         ]
 
     def _get_supported_languages(self) -> List[str]:
         """Get list of currently supported languages for analysis."""
-        return ["python", "javascript", "typescript", "java", "csharp", "c", "cpp", "php"]
\ No newline at end of file
+        return list(_SUPPORTED_LANGUAGES)
\ No newline at end of file
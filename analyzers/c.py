@@ -1,26 +1,67 @@
 """
 C AST analyzer for call graph generation using tree-sitter.
 """
+import functools
 import logging
 import os
 import traceback
 from typing import List, Set, Optional, Tuple
 from pathlib import Path
+from operator import attrgetter, itemgetter
 import sys
 import os
 
-from tree_sitter import Parser
-from ..setup_parser import get_parser
+from tree_sitter import Query
+
+from ..setup_parser import get_cached_parser, get_parser
 from ..models import Node, CallRelationship
 
 logger = logging.getLogger(__name__)
 
+_C_EXTENSIONS = (".c", ".h")
+
+# Maps both path separators to the module path separator in one pass.
+_SEP_TRANS = str.maketrans({"/": ".", "\\": "."})
+
+# Query patterns, each tagged with the capture naming the matched node.
+_QUERY_PATTERNS = (
+    ("function", "(function_definition declarator: (function_declarator) @declarator) @function"),
+    ("declaration", "[(function_declarator) (init_declarator)] @declaration"),
+    ("call", "(call_expression function: (identifier) @callee) @call"),
+    ("call", "(call_expression function: (field_expression field: (field_identifier) @callee)) @call"),
+)
+_PATTERN_TAGS = tuple(tag for tag, _ in _QUERY_PATTERNS)
+
+# Common C library functions that are not reported as graph nodes.
+_EXCLUDED_NAMES = frozenset({
+    "main", "printf", "scanf", "malloc", "free", "strlen",
+    "strcpy", "strcmp", "atoi", "itoa", "exit", "assert",
+    "fopen", "fclose", "fread", "fwrite", "fprintf", "fscanf",
+    "puts", "gets", "abort",
+})
+
+
+@functools.lru_cache(maxsize=None)
+def _get_query() -> Query:
+    """Compile the C extraction query once per process.
+
+    Matches are iterated through py-tree-sitter rather than by calling
+    libtree-sitter's query cursor directly: the binding does not expose its
+    TSTree pointer, and its Node wrappers are only created for the captured
+    nodes, which are a small fraction of the tree.
+    """
+    return Query(get_parser("c"), "\n".join(pattern for _, pattern in _QUERY_PATTERNS))
+
 
 class TreeSitterCAnalyzer:
     def __init__(self, file_path: str, content: str, repo_path: str = None):
         self.file_path = Path(file_path)
         self.content = content
+        self._content_bytes = content.encode("utf8")
         self.repo_path = repo_path or ""
+        self._relative_path = self._compute_relative_path()
+        self._module_path = self._compute_module_path()
+        self._id_cache = {}
         self.nodes: List[Node] = []
         self.call_relationships: List[CallRelationship] = []
         
@@ -29,18 +70,9 @@ class TreeSitterCAnalyzer:
         self.seen_relationships = set()
 
         try:
-            c_language = get_parser("c")
-            if c_language is None:
+            self.parser = get_cached_parser("c")
+            if self.parser is None:
                 logger.warning("C parser not available")
-                self.parser = None
-            else:
-                self.parser = Parser()
-                try:
-                    # Try the newer API first (tree-sitter>=0.20.0)
-                    self.parser.set_language(c_language)
-                except AttributeError:
-                    # Fallback to older API if needed
-                    self.parser.language = c_language
 
         except Exception as e:
             logger.error(f"Failed to initialize C parser: {e}")
@@ -63,13 +95,14 @@ class TreeSitterCAnalyzer:
             return
 
         try:
-            tree = self.parser.parse(bytes(self.content, "utf8"))
+            tree = self.parser.parse(self._content_bytes)
             root_node = tree.root_node
 
             logger.debug(f"Parsed AST with root node type: {root_node.type}")
 
-            self._extract_functions(root_node)
-            self._extract_call_relationships(root_node)
+            self._traverse_tree(root_node)
+            self.nodes.sort(key=attrgetter("start_line"))
+            self._resolve_call_relationships()
 
             logger.debug(
                 f"Analysis complete: {len(self.nodes)} nodes, {len(self.call_relationships)} relationships"
@@ -78,22 +111,7 @@ class TreeSitterCAnalyzer:
         except Exception as e:
             logger.error(f"Error analyzing C file {self.file_path}: {e}", exc_info=True)
 
-    def _get_module_path(self) -> str:
-        if self.repo_path:
-            try:
-                rel_path = os.path.relpath(str(self.file_path), self.repo_path)
-            except ValueError:
-                rel_path = str(self.file_path)
-        else:
-            rel_path = str(self.file_path)
-        
-        for ext in ['.c', '.h']:
-            if rel_path.endswith(ext):
-                rel_path = rel_path[:-len(ext)]
-                break
-        return rel_path.replace('/', '.').replace('\\', '.')
-
-    def _get_relative_path(self) -> str:
+    def _compute_relative_path(self) -> str:
         if self.repo_path:
             try:
                 return os.path.relpath(str(self.file_path), self.repo_path)
@@ -102,40 +120,96 @@ class TreeSitterCAnalyzer:
         else:
             return str(self.file_path)
 
-    def _get_component_id(self, name: str) -> str:
-        module_path = self._get_module_path()
-        return f"{module_path}.{name}"
+    def _compute_module_path(self) -> str:
+        rel_path, ext = os.path.splitext(self._relative_path)
+        if ext not in _C_EXTENSIONS:
+            rel_path = self._relative_path
+        return rel_path.translate(_SEP_TRANS)
 
-    def _extract_functions(self, node) -> None:
-        self._traverse_for_functions(node)
-        self.nodes.sort(key=lambda n: n.start_line)
+    def _get_module_path(self) -> str:
+        return self._module_path
 
-    def _traverse_for_functions(self, node) -> None:
-        if node.type in ["function_definition"]:
-            func = self._extract_function_definition(node)
-            if func and self._should_include_function(func):
-                self.nodes.append(func)
-                self.top_level_nodes[func.name] = func
-        
-        elif node.type in ["function_declarator", "init_declarator"]:
-            # Handle function declarations in headers
-            func = self._extract_function_declaration(node)
+    def _get_relative_path(self) -> str:
+        return self._relative_path
+
+    def _get_component_id(self, name: str) -> str:
+        # Each ID is built and interned once per file, so every node and
+        # relationship referring to a function shares one string object and
+        # key comparisons reduce to identity checks.
+        component_id = self._id_cache.get(name)
+        if component_id is None:
+            component_id = self._id_cache[name] = sys.intern(f"{self._module_path}.{name}")
+        return component_id
+
+    def _traverse_tree(self, node) -> None:
+        """Extract functions and call sites with the tree-sitter query engine.
+
+        Pattern matching runs in tree-sitter's native code, so Python only
+        touches the nodes of interest rather than every node in the tree.
+        """
+        # Matches are replayed in document order (outer nodes first) so the
+        # enclosing function is known when its calls are reached.
+        matches = []
+        function_matches = 0
+        for pattern_index, captures in _get_query().matches(node):
+            tag = _PATTERN_TAGS[pattern_index]
+            if tag != "call":
+                function_matches += 1
+            target = captures[tag][0]
+            matches.append((target.start_byte, -target.end_byte, tag, target, captures))
+        matches.sort(key=itemgetter(0, 1))
+
+        # Every function node comes from a function or declaration match, so
+        # the node list is allocated once at that size and trimmed at the end.
+        nodes = [None] * function_matches
+        node_count = 0
+
+        # Stack of (end byte, function name) for the enclosing function
+        # definitions; entries are dropped once a match lies past their end.
+        context_stack = []
+        for start_byte, _, tag, target, captures in matches:
+            while context_stack and context_stack[-1][0] <= start_byte:
+                context_stack.pop()
+
+            if tag == "call":
+                current_top_level = context_stack[-1][1] if context_stack else None
+                if not current_top_level:
+                    continue
+                call_info = self._extract_call_from_node(target, self._get_node_text(captures["callee"][0]))
+                if call_info:
+                    # Update the caller with the current function context
+                    call_info.caller = self._get_component_id(current_top_level)
+                    self._add_relationship(call_info)
+                continue
+
+            if tag == "function":
+                declarator = captures["declarator"][0]
+                func = self._extract_function_definition(target, declarator)
+            else:
+                # Handle function declarations in headers
+                func = self._extract_function_declaration(target)
             if func and self._should_include_function(func):
-                self.nodes.append(func)
+                nodes[node_count] = func
+                node_count += 1
                 self.top_level_nodes[func.name] = func
-        
-        for child in node.children:
-            self._traverse_for_functions(child)
 
-    def _extract_function_definition(self, node) -> Optional[Node]:
-        """Extract function definition."""
+            if tag == "function":
+                # Calls inside excluded functions are still attributed to them
+                name = func.name if func else self._extract_function_name(declarator)
+                context_stack.append((target.end_byte, name))
+
+        del nodes[node_count:]
+        self.nodes.extend(nodes)
+
+    def _extract_function_definition(self, node, declarator=None) -> Optional[Node]:
+        """Extract function definition, optionally with its already-known declarator."""
         try:
             # Look for the function name in the declarator
-            declarator = None
-            for child in node.children:
-                if child.type in ["declarator", "function_declarator"]:
-                    declarator = child
-                    break
+            if declarator is None:
+                for child in node.children:
+                    if child.type in ["declarator", "function_declarator"]:
+                        declarator = child
+                        break
             
             if not declarator:
                 return None
@@ -148,7 +222,7 @@ class TreeSitterCAnalyzer:
             line_start = node.start_point[0] + 1
             line_end = node.end_point[0] + 1
             parameters = self._extract_parameters(declarator)
-            code_snippet = "\n".join(self.content.splitlines()[line_start - 1 : line_end])
+            code_snippet = self._get_node_text(node)
             
             component_id = self._get_component_id(name)
             relative_path = self._get_relative_path()
@@ -229,12 +303,7 @@ class TreeSitterCAnalyzer:
         return None
 
     def _should_include_function(self, func: Node) -> bool:
-        excluded_names = {"main", "printf", "scanf", "malloc", "free", "strlen", 
-                         "strcpy", "strcmp", "atoi", "itoa", "exit", "assert",
-                         "fopen", "fclose", "fread", "fwrite", "fprintf", "fscanf",
-                         "puts", "gets", "exit", "abort"}  # Common C library functions
-
-        if func.name in excluded_names:
+        if func.name in _EXCLUDED_NAMES:
             logger.debug(f"Skipping excluded function: {func.name}")
             return False
 
@@ -273,85 +342,41 @@ class TreeSitterCAnalyzer:
                     return name
         return None
 
-    def _extract_call_relationships(self, node) -> None:
-        current_top_level = None
-        self._traverse_for_calls(node, current_top_level)
-
-    def _traverse_for_calls(self, node, current_top_level) -> None:
-        # Look for function calls
-        if node.type == "call_expression":
-            call_info = self._extract_call_from_node(node)
-            if call_info and current_top_level:
-                # Update the caller with the current function context
-                call_info.caller = f"{self._get_module_path()}.{current_top_level}"
-                self._add_relationship(call_info)
-
-        # Find the current function context
-        if node.type == "function_definition":
-            declarator = None
-            for child in node.children:
-                if child.type in ["declarator", "function_declarator"]:
-                    declarator = child
-                    break
-            
-            if declarator:
-                current_top_level = self._extract_function_name(declarator)
+    def _resolve_call_relationships(self) -> None:
+        """Mark calls whose callee is defined in this file.
 
-        for child in node.children:
-            self._traverse_for_calls(child, current_top_level)
+        Runs after the walk so that calls to functions defined later in the
+        file are resolved as well.
+        """
+        # Compare full IDs against one set built up front instead of slicing
+        # the module prefix off every callee; the interned callee strings
+        # already carry their hash.
+        known_ids = {func.id for func in self.top_level_nodes.values()}
+        for relationship in self.call_relationships:
+            relationship.is_resolved = relationship.callee in known_ids
 
-    def _extract_call_from_node(self, node) -> Optional[CallRelationship]:
+    def _extract_call_from_node(self, node, callee_name: str) -> Optional[CallRelationship]:
         """Extract call relationship from a call_expression node."""
         try:
             call_line = node.start_point[0] + 1
-            callee_name = self._extract_callee_name(node)
             
             if not callee_name:
                 return None
             
             # We'll set the caller later when we have the function context
-            callee_id = f"{self._get_module_path()}.{callee_name}"
-            
-            # Check if the callee is a known function in our analysis
-            is_resolved = callee_name in self.top_level_nodes
+            callee_id = self._get_component_id(callee_name)
             
             return CallRelationship(
                 caller="",  # Will be set later with current function context
                 callee=callee_id,
                 call_line=call_line,
-                is_resolved=is_resolved,
+                is_resolved=False,  # Resolved once the whole file has been walked
             )
             
         except Exception as e:
             logger.debug(f"Error extracting call relationship: {e}")
             return None
 
-    def _extract_callee_name(self, call_node) -> Optional[str]:
-        """Extract callee name from a call_expression node."""
-        for child in call_node.children:
-            if child.type == "identifier":
-                return self._get_node_text(child)
-            elif child.type == "field_expression":  # For struct.function calls
-                for subchild in child.children:
-                    if subchild.type == "field_identifier":
-                        return self._get_node_text(subchild)
-            elif child.type == "function_declarator":  # For function pointers
-                name = self._extract_function_name(child)
-                if name:
-                    return name
-        
-        # Look for the function name in the first child
-        if call_node.children:
-            first_child = call_node.children[0]
-            if first_child.type == "identifier":
-                return self._get_node_text(first_child)
-            elif first_child.type == "field_expression":
-                for subchild in first_child.children:
-                    if subchild.type == "field_identifier":
-                        return self._get_node_text(subchild)
-        
-        return None
-
     def _find_child_by_type(self, node, node_type: str):
         """Find first child node of specified type."""
         for child in node.children:
@@ -360,9 +385,7 @@ class TreeSitterCAnalyzer:
         return None
 
     def _get_node_text(self, node) -> str:
-        start_byte = node.start_byte
-        end_byte = node.end_byte
-        return self.content.encode("utf8")[start_byte:end_byte].decode("utf8")
+        return self._content_bytes[node.start_byte:node.end_byte].decode("utf8")
 
 
 def analyze_c_file(
@@ -1,46 +1,107 @@
 """
 C++ AST analyzer for call graph generation using tree-sitter.
 """
+import functools
 import logging
 import os
 import traceback
 from typing import List, Set, Optional, Tuple
+from operator import attrgetter, itemgetter
 from pathlib import Path
 import sys
 import os
 
-from tree_sitter import Parser
-from ..setup_parser import get_parser
+from tree_sitter import Query
+
+from ..setup_parser import get_cached_parser, get_parser
 from ..models import Node, CallRelationship
 
 logger = logging.getLogger(__name__)
 
+_CPP_EXTENSIONS = frozenset({".cpp", ".cxx", ".cc", ".c", ".hpp", ".hxx", ".h"})
+
+# Maps both path separators to the module path separator in one pass.
+_SEP_TRANS = str.maketrans({"/": ".", "\\": "."})
+
+# Declarators that can wrap the identifier naming a function.
+_NESTED_DECLARATOR_TYPES = frozenset({"function_declarator", "init_declarator", "field_declarator"})
+
+# Node types naming a method or constructor defined inside a class body.
+_METHOD_NAME_TYPES = frozenset({"field_identifier", "identifier"})
+
+# Callee expression type -> type of its child that names the called function.
+_CALLEE_NAME_CHILD_TYPES = {
+    "field_expression": "field_identifier",
+    "scoped_identifier": "identifier",
+    "qualified_identifier": "identifier",
+}
+
+# Common C/C++ library functions that are not reported as graph nodes.
+_EXCLUDED_NAMES = frozenset({
+    "main", "printf", "scanf", "malloc", "free", "strlen",
+    "strcpy", "strcmp", "atoi", "itoa", "exit", "assert",
+    "fopen", "fclose", "fread", "fwrite", "fprintf", "fscanf",
+    "puts", "gets", "abort", "cout", "cin", "cerr",
+})
+_EXCLUDED_NAME_BYTES = frozenset(name.encode("ascii") for name in _EXCLUDED_NAMES)
+
+
+# Query patterns, each tagged with the capture naming the matched node.
+_QUERY_PATTERNS = (
+    ("class", "[(class_specifier) (struct_specifier)] @class"),
+    ("function", "(function_definition) @function"),
+    ("declaration", "(function_declarator) @declaration"),
+    ("call", "(call_expression) @call"),
+)
+_PATTERN_TAGS = tuple(tag for tag, _ in _QUERY_PATTERNS)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_query() -> Optional[Query]:
+    """Compile the C++ extraction query once per process, or None if the grammar is unavailable."""
+    language = get_parser("cpp")
+    if language is None:
+        return None
+    return Query(language, "\n".join(pattern for _, pattern in _QUERY_PATTERNS))
+
+
+@functools.lru_cache(maxsize=65536)
+def _cached_relpath(file_path: str, repo_path: str) -> str:
+    """Path of a file relative to the repository, shared by all analyzers in the process."""
+    if repo_path:
+        try:
+            return os.path.relpath(file_path, repo_path)
+        except ValueError:
+            return file_path
+    else:
+        return file_path
+
 
 class TreeSitterCppAnalyzer:
     def __init__(self, file_path: str, content: str, repo_path: str = None):
         self.file_path = Path(file_path)
         self.content = content
+        # Encoded once; node text and source snippets are slices of it
+        self._content_bytes = content.encode("utf8")
         self.repo_path = repo_path or ""
+        # The paths depend only on file_path and repo_path, so compute them once
+        self._relative_path = self._compute_relative_path()
+        self._module_path = self._compute_module_path()
+        self._module_prefix = self._module_path + "."
         self.nodes: List[Node] = []
         self.call_relationships: List[CallRelationship] = []
         
         self.top_level_nodes = {}
+        # Bare names of the classes and functions defined in this file, which
+        # is what callee names are matched against
+        self._function_names: Set[str] = set()
         
-        self.seen_relationships = set()
+        self.seen_relationships: Set[Tuple[str, str, int]] = set()
 
         try:
-            cpp_language = get_parser("cpp")
-            if cpp_language is None:
+            self.parser = get_cached_parser("cpp")
+            if self.parser is None:
                 logger.warning("C++ parser not available")
-                self.parser = None
-            else:
-                self.parser = Parser()
-                try:
-                    # Try the newer API first (tree-sitter>=0.20.0)
-                    self.parser.set_language(cpp_language)
-                except AttributeError:
-                    # Fallback to older API if needed
-                    self.parser.language = cpp_language
 
         except Exception as e:
             logger.error(f"Failed to initialize C++ parser: {e}")
@@ -63,13 +124,14 @@ class TreeSitterCppAnalyzer:
             return
 
         try:
-            tree = self.parser.parse(bytes(self.content, "utf8"))
+            tree = self.parser.parse(self._content_bytes)
             root_node = tree.root_node
 
             logger.debug(f"Parsed AST with root node type: {root_node.type}")
 
-            self._extract_functions(root_node)
-            self._extract_call_relationships(root_node)
+            self._walk_matches(root_node, _get_query())
+            self.nodes.sort(key=attrgetter("start_line"))
+            self._resolve_call_relationships()
 
             logger.debug(
                 f"Analysis complete: {len(self.nodes)} nodes, {len(self.call_relationships)} relationships"
@@ -78,129 +140,137 @@ class TreeSitterCppAnalyzer:
         except Exception as e:
             logger.error(f"Error analyzing C++ file {self.file_path}: {e}", exc_info=True)
 
+    def _compute_relative_path(self) -> str:
+        return _cached_relpath(str(self.file_path), self.repo_path)
+
+    def _compute_module_path(self) -> str:
+        rel_path, ext = os.path.splitext(self._relative_path)
+        if ext.lower() not in _CPP_EXTENSIONS:
+            rel_path = self._relative_path
+        return rel_path.translate(_SEP_TRANS)
+
     def _get_module_path(self) -> str:
-        if self.repo_path:
-            try:
-                rel_path = os.path.relpath(str(self.file_path), self.repo_path)
-            except ValueError:
-                rel_path = str(self.file_path)
-        else:
-            rel_path = str(self.file_path)
-        
-        for ext in ['.cpp', '.cxx', '.cc', '.c', '.hpp', '.hxx', '.h']:
-            if rel_path.endswith(ext):
-                rel_path = rel_path[:-len(ext)]
-                break
-        return rel_path.replace('/', '.').replace('\\', '.')
+        return self._module_path
 
     def _get_relative_path(self) -> str:
-        if self.repo_path:
-            try:
-                return os.path.relpath(str(self.file_path), self.repo_path)
-            except ValueError:
-                return str(self.file_path)
-        else:
-            return str(self.file_path)
+        return self._relative_path
 
     def _get_component_id(self, name: str, class_name: str = None, is_method: bool = False) -> str:
-        module_path = self._get_module_path()
-        
         if is_method and class_name:
-            return f"{module_path}.{class_name}.{name}"
-        elif class_name and not is_method: 
-            return f"{module_path}.{name}"
-        else:  
-            return f"{module_path}.{name}"
-
-    def _extract_functions(self, node) -> None:
-        self._traverse_for_functions(node)
-        self.nodes.sort(key=lambda n: n.start_line)
-
-    def _traverse_for_functions(self, node) -> None:
-        if node.type in ["class_specifier", "struct_specifier"]:
-            cls = self._extract_class_declaration(node)
-            if cls:
-                self.nodes.append(cls)
-                self.top_level_nodes[cls.name] = cls
-                
-                self._extract_methods_from_class(node, cls.name)
-        
-        elif node.type == "function_definition":
-            containing_class = self._find_containing_class(node)
-            if containing_class is None:
-                func = self._extract_function_definition(node)
-                if func and self._should_include_function(func):
-                    self.nodes.append(func)
-                    self.top_level_nodes[func.name] = func
-        
-        elif node.type == "function_declarator":
-            # Handle function declarations in headers
-            func = self._extract_function_declaration(node)
-            if func and self._should_include_function(func):
+            return f"{self._module_prefix}{class_name}.{name}"
+        return self._module_prefix + name
+
+    def _walk_matches(self, root, query: Query) -> None:
+        """Extract classes, functions and call sites from the query's matches.
+
+        The query engine finds the handled nodes in native code; the matches
+        are then replayed in document order through the _on_* handlers, with
+        the enclosing contexts tracked by byte range.
+        """
+        handlers = {
+            "class": self._on_class,
+            "function": self._on_function_definition,
+            "declaration": self._on_function_declarator,
+            "call": self._on_call,
+        }
+
+        matched = []
+        for pattern_index, captures in query.matches(root):
+            tag = _PATTERN_TAGS[pattern_index]
+            node = captures[tag][0]
+            matched.append((node.start_byte, -node.end_byte, tag, node))
+        # Outer nodes sort before the nodes they contain
+        matched.sort(key=itemgetter(0, 1))
+
+        # Stack of (end byte, class context, caller context) for the nodes
+        # that changed the context; entries are dropped once a match lies
+        # past their end.
+        context_stack = []
+        for start_byte, _, tag, node in matched:
+            while context_stack and context_stack[-1][0] <= start_byte:
+                context_stack.pop()
+            if context_stack:
+                _, class_ctx, caller_ctx = context_stack[-1]
+            else:
+                class_ctx = caller_ctx = None
+
+            new_class_ctx, new_caller_ctx = handlers[tag](node, class_ctx, caller_ctx)
+            if new_class_ctx != class_ctx or new_caller_ctx != caller_ctx:
+                context_stack.append((node.end_byte, new_class_ctx, new_caller_ctx))
+
+    def _on_class(self, node, class_ctx, caller_ctx):
+        cls = self._extract_class_declaration(node)
+        if cls is None:
+            return class_ctx, caller_ctx
+
+        self.nodes.append(cls)
+        self.top_level_nodes[cls.name] = cls
+        self._function_names.add(cls.name)
+        # Calls directly inside a class body are attributed to the class
+        return cls.name, cls.name
+
+    def _on_function_definition(self, node, class_ctx, caller_ctx):
+        # Methods defined inside a class body are not reported as nodes
+        if class_ctx is None:
+            func = self._extract_function_definition(node, class_ctx)
+            if func:
                 self.nodes.append(func)
                 self.top_level_nodes[func.name] = func
-        
-        for child in node.children:
-            self._traverse_for_functions(child)
-
-    def _extract_methods_from_class(self, class_node, class_name: str) -> None:
-        for child in class_node.children:
-            if child.type in ["function_definition", "declaration"]:
-                # Check if this is a method definition inside the class
-                method_name = self._get_method_name(child)
-                if method_name:
-                    method_key = f"{self._get_module_path()}.{class_name}.{method_name}"
-                    method_node = self._create_method_node(child, method_name, class_name)
-                    if method_node:
-                        self.top_level_nodes[method_key] = method_node
-
-    def _get_method_name(self, method_node) -> Optional[str]:
-        """Get method name from function_definition or declaration node."""
-        for child in method_node.children:
-            if child.type in ["declarator", "function_declarator"]:
-                return self._extract_function_name(child)
+                self._function_names.add(func.name)
+
+        declarator = self._get_function_declarator(node)
+        if declarator is None:
+            return class_ctx, caller_ctx
+
+        name = self._extract_function_name(declarator)
+        if class_ctx is not None:
+            # Calls to methods defined in this file still count as resolved.
+            # In a class body the declarator names a method with a
+            # field_identifier, and a constructor with a plain identifier.
+            name_node = declarator.child_by_field_name("declarator")
+            if name_node is not None and name_node.type in _METHOD_NAME_TYPES:
+                self._function_names.add(self._get_node_text(name_node))
+        return class_ctx, name
+
+    def _on_function_declarator(self, node, class_ctx, caller_ctx):
+        # Handle function declarations in headers
+        func = self._extract_function_declaration(node)
+        if func:
+            self.nodes.append(func)
+            self.top_level_nodes[func.name] = func
+            self._function_names.add(func.name)
+        return class_ctx, caller_ctx
+
+    def _on_call(self, node, class_ctx, caller_ctx):
+        call_info = self._extract_call_from_node(node)
+        if call_info and caller_ctx:
+            # Update the caller with the current function context
+            call_info.caller = self._module_prefix + caller_ctx
+            self._add_relationship(call_info)
+        return class_ctx, caller_ctx
+
+    def _resolve_call_relationships(self) -> None:
+        """Mark calls whose callee is defined in this file.
+
+        Runs after the walk so that calls to functions defined later in the
+        file are resolved as well.
+        """
+        prefix_len = len(self._module_prefix)
+        for relationship in self.call_relationships:
+            relationship.is_resolved = relationship.callee[prefix_len:] in self._function_names
+
+    def _get_function_declarator(self, node):
+        """Get the function_declarator of a definition or declaration, if it has one."""
+        declarator = node.child_by_field_name("declarator")
+        if declarator is not None and declarator.type == "function_declarator":
+            return declarator
         return None
 
-    def _create_method_node(self, node, method_name: str, class_name: str) -> Optional[Node]:
-        """Create a method node for relationship mapping."""
-        try:
-            line_start = node.start_point[0] + 1
-            line_end = node.end_point[0] + 1
-            component_id = self._get_component_id(method_name, class_name, is_method=True)
-            relative_path = self._get_relative_path()
-            
-            return Node(
-                id=component_id,
-                name=method_name,
-                component_type="method",
-                file_path=str(self.file_path),
-                relative_path=relative_path,
-                source_code="\n".join(self.content.splitlines()[line_start - 1 : line_end]),
-                start_line=line_start,
-                end_line=line_end,
-                has_docstring=False,
-                docstring="",
-                parameters=None,
-                node_type="method",
-                base_classes=None,
-                class_name=class_name,
-                display_name=f"method {method_name}",
-                component_id=component_id
-            )
-        except Exception as e:
-            logger.debug(f"Error creating method node for {method_name}: {e}")
-            return None
-
     def _extract_class_declaration(self, node) -> Optional[Node]:
         """Extract class or struct declaration."""
         try:
-            name_node = None
-            for child in node.children:
-                if child.type == "type_identifier" or child.type == "identifier":
-                    name_node = child
-                    break
-            
-            if not name_node:
+            name_node = node.child_by_field_name("name")
+            if name_node is None or name_node.type not in ("type_identifier", "identifier"):
                 return None
                 
             name = self._get_node_text(name_node)
@@ -216,7 +286,7 @@ class TreeSitterCppAnalyzer:
                         if base.type == "type_identifier":
                             base_classes.append(self._get_node_text(base))
             
-            code_snippet = "\n".join(self.content.splitlines()[line_start - 1 : line_end])
+            code_snippet = self._get_node_text(node)
             
             node_type = "class" if node.type == "class_specifier" else "struct"
             display_name = f"{node_type} {name}"
@@ -245,35 +315,33 @@ class TreeSitterCppAnalyzer:
         except Exception:
             return None
 
-    def _extract_function_definition(self, node) -> Optional[Node]:
-        """Extract function definition."""
+    def _extract_function_definition(self, node, containing_class: Optional[str] = None) -> Optional[Node]:
+        """Extract function definition, given the name of the class it is defined in."""
         try:
             # Look for the function name in the declarator
-            declarator = None
-            for child in node.children:
-                if child.type in ["declarator", "function_declarator"]:
-                    declarator = child
-                    break
-            
-            if not declarator:
+            declarator = self._get_function_declarator(node)
+            if declarator is None:
                 return None
             
             # Extract function name from the declarator
-            name = self._extract_function_name(declarator)
-            if not name:
+            name_node = self._find_function_name_node(declarator)
+            if name_node is None:
                 return None
+            name_bytes = self._get_node_bytes(name_node)
+            if not name_bytes or not self._should_include_function(name_bytes):
+                return None
+            name = name_bytes.decode("utf8")
             
             line_start = node.start_point[0] + 1
             line_end = node.end_point[0] + 1
             parameters = self._extract_parameters(declarator)
-            code_snippet = "\n".join(self.content.splitlines()[line_start - 1 : line_end])
+            code_snippet = self._get_node_text(node)
             
             # Determine if this is a constructor/destructor by checking name and class context
             display_name = f"function {name}"
             node_type = "function"
             
             # Check if this might be a constructor or destructor
-            containing_class = self._find_containing_class(node)
             if containing_class:
                 if name == containing_class:
                     display_name = f"constructor {name}"
@@ -314,9 +382,13 @@ class TreeSitterCppAnalyzer:
         """Extract function declaration."""
         try:
             # Extract function name from the declarator
-            name = self._extract_function_name(node)
-            if not name:
+            name_node = self._find_function_name_node(node)
+            if name_node is None:
                 return None
+            name_bytes = self._get_node_bytes(name_node)
+            if not name_bytes or not self._should_include_function(name_bytes):
+                return None
+            name = name_bytes.decode("utf8")
             
             line_start = node.start_point[0] + 1
             line_end = node.end_point[0] + 1
@@ -350,103 +422,72 @@ class TreeSitterCppAnalyzer:
 
     def _extract_function_name(self, node) -> Optional[str]:
         """Extract function name from a declarator node."""
+        name_node = self._find_function_name_node(node)
+        return self._get_node_text(name_node) if name_node is not None else None
+
+    def _find_function_name_node(self, node):
+        """Find the identifier node naming the function of a declarator node."""
         if node.type == "identifier":
-            return self._get_node_text(node)
-        
-        for child in node.children:
-            if child.type == "identifier":
-                return self._get_node_text(child)
-            elif child.type in ["function_declarator", "init_declarator", "field_declarator"]:
-                name = self._extract_function_name(child)
-                if name:
-                    return name
-            elif child.type == "scoped_identifier":
+            return node
+
+        # Depth-first search through nested declarators, in source order
+        stack = list(reversed(node.named_children))
+        while stack:
+            child = stack.pop()
+            child_type = child.type
+            if child_type == "identifier":
+                return child
+            elif child_type in _NESTED_DECLARATOR_TYPES:
+                stack.extend(reversed(child.named_children))
+            elif child_type == "scoped_identifier":
                 # Handle namespaced functions like std::function_name
-                for subchild in child.children:
+                for subchild in child.named_children:
                     if subchild.type == "identifier":
-                        return self._get_node_text(subchild)
-        
-        return None
+                        return subchild
 
-    def _should_include_function(self, func: Node) -> bool:
-        excluded_names = {"main", "printf", "scanf", "malloc", "free", "strlen", 
-                         "strcpy", "strcmp", "atoi", "itoa", "exit", "assert",
-                         "fopen", "fclose", "fread", "fwrite", "fprintf", "fscanf",
-                         "puts", "gets", "exit", "abort", "cout", "cin", "cerr"}  # Common C/C++ library functions
+        return None
 
-        if func.name in excluded_names or func.name.startswith('operator'):
-            logger.debug(f"Skipping excluded function: {func.name}")
+    def _should_include_function(self, name_bytes: bytes) -> bool:
+        # Compared as raw bytes so excluded names are never decoded
+        if name_bytes in _EXCLUDED_NAME_BYTES or name_bytes.startswith(b"operator"):
+            logger.debug(f"Skipping excluded function: {name_bytes.decode('utf8')}")
             return False
 
         return True
 
     def _extract_parameters(self, node) -> List[str]:
+        # The parameter list hangs off the function_declarator's "parameters"
+        # field; fall back to a scan of the direct children only
+        parameter_list = node.child_by_field_name("parameters")
+        if parameter_list is None:
+            parameter_list = self._find_child_by_type(node, "parameter_list")
+            if parameter_list is None:
+                return []
+
         parameters = []
-        
-        # Look for parameter_list in the declarator
-        for child in node.children:
-            if child.type == "parameter_list":
-                for param_node in child.children:
-                    if param_node.type == "parameter_declaration":
-                        param_name = self._extract_parameter_name(param_node)
-                        if param_name:
-                            parameters.append(param_name)
-            else:
-                # Recursively look for parameter_list
-                params = self._extract_parameters(child)
-                if params:
-                    parameters.extend(params)
-        
+        for param_node in parameter_list.named_children:
+            if param_node.type == "parameter_declaration":
+                param_name = self._extract_parameter_name(param_node)
+                if param_name:
+                    parameters.append(param_name)
+
         return parameters
 
     def _extract_parameter_name(self, param_node) -> Optional[str]:
         """Extract parameter name from a parameter declaration."""
-        for child in param_node.children:
-            if child.type == "identifier":
-                return self._get_node_text(child)
-            elif child.type == "parameter_list":
-                # Handle function pointer parameters
-                continue
-            elif child.type == "declarator":
-                # Look inside declarators for the identifier
-                return self._extract_parameter_name(child)
-        return None
-
-    def _extract_call_relationships(self, node) -> None:
-        current_top_level = None
-        self._traverse_for_calls(node, current_top_level)
-
-    def _traverse_for_calls(self, node, current_top_level) -> None:
-        # Look for function calls
-        if node.type == "call_expression":
-            call_info = self._extract_call_from_node(node)
-            if call_info and current_top_level:
-                # Update the caller with the current function context
-                call_info.caller = f"{self._get_module_path()}.{current_top_level}"
-                self._add_relationship(call_info)
-
-        # Find the current function or method context
-        if node.type == "function_definition":
-            declarator = None
-            for child in node.children:
-                if child.type in ["declarator", "function_declarator"]:
-                    declarator = child
-                    break
-            
-            if declarator:
-                current_top_level = self._extract_function_name(declarator)
-        elif node.type in ["class_specifier", "struct_specifier"]:
-            # Handle methods inside classes
-            name_node = None
-            for child in node.children:
-                if child.type == "type_identifier" or child.type == "identifier":
-                    name_node = child
+        node = param_node
+        while node is not None:
+            inner = None
+            for child in node.named_children:
+                if child.type == "identifier":
+                    return self._get_node_text(child)
+                elif child.type == "declarator":
+                    # Look inside declarators for the identifier
+                    inner = child
                     break
-            if name_node:
-                current_top_level = self._get_node_text(name_node)
-
-        for child in node.children:
-            self._traverse_for_calls(child, current_top_level)
+            # Function pointer parameter lists are skipped
+            node = inner
+        return None
 
     def _extract_call_from_node(self, node) -> Optional[CallRelationship]:
         """Extract call relationship from a call_expression node."""
@@ -458,16 +499,13 @@ class TreeSitterCppAnalyzer:
                 return None
             
             # We'll set the caller later when we have the function context
-            callee_id = f"{self._get_module_path()}.{callee_name}"
-            
-            # Check if the callee is a known function in our analysis
-            is_resolved = callee_name in self.top_level_nodes
+            callee_id = self._module_prefix + callee_name
             
             return CallRelationship(
                 caller="",  # Will be set later with current function context
                 callee=callee_id,
                 call_line=call_line,
-                is_resolved=is_resolved,
+                is_resolved=False,  # Resolved once the whole file has been walked
             )
             
         except Exception as e:
@@ -476,42 +514,24 @@ class TreeSitterCppAnalyzer:
 
     def _extract_callee_name(self, call_node) -> Optional[str]:
         """Extract callee name from a call_expression node."""
-        for child in call_node.children:
-            if child.type == "identifier":
-                return self._get_node_text(child)
-            elif child.type == "field_expression":  # For obj.method() calls
-                for subchild in child.children:
-                    if subchild.type == "field_identifier":
-                        return self._get_node_text(subchild)
-            elif child.type == "function_declarator":  # For function pointers
-                name = self._extract_function_name(child)
-                if name:
-                    return name
-            elif child.type == "scoped_identifier":  # For namespaced calls like std::function
-                for subchild in child.children:
-                    if subchild.type == "identifier":
-                        # Return the last identifier (function name)
-                        return self._get_node_text(subchild)
-            elif child.type == "qualified_identifier":  # For class::method calls
-                for subchild in child.children:
-                    if subchild.type == "identifier":
-                        # Return the last identifier (method name)
-                        return self._get_node_text(subchild)
-        
-        # Look for the function name in the first child
-        if call_node.children:
-            first_child = call_node.children[0]
-            if first_child.type == "identifier":
-                return self._get_node_text(first_child)
-            elif first_child.type == "field_expression":
-                for subchild in first_child.children:
-                    if subchild.type == "field_identifier":
-                        return self._get_node_text(subchild)
-            elif first_child.type == "qualified_identifier":
-                for subchild in first_child.children:
-                    if subchild.type == "identifier":
-                        return self._get_node_text(subchild)
-        
+        function = call_node.child_by_field_name("function")
+        if function is None:
+            return None
+
+        function_type = function.type
+        if function_type == "identifier":
+            return self._get_node_text(function)
+        elif function_type == "function_declarator":  # For function pointers
+            return self._extract_function_name(function)
+
+        # obj.method(), std::function() and Class::method() calls name the
+        # callee in a child of the function expression
+        name_type = _CALLEE_NAME_CHILD_TYPES.get(function_type)
+        if name_type is not None:
+            for child in function.named_children:
+                if child.type == name_type:
+                    return self._get_node_text(child)
+
         return None
 
     def _find_child_by_type(self, node, node_type: str):
@@ -521,22 +541,11 @@ class TreeSitterCppAnalyzer:
                 return child
         return None
 
+    def _get_node_bytes(self, node) -> bytes:
+        return self._content_bytes[node.start_byte:node.end_byte]
+
     def _get_node_text(self, node) -> str:
-        start_byte = node.start_byte
-        end_byte = node.end_byte
-        return self.content.encode("utf8")[start_byte:end_byte].decode("utf8")
-
-    def _find_containing_class(self, method_node) -> Optional[str]:
-        """Find the containing class for a method."""
-        current = method_node.parent
-        while current:
-            if current.type in ["class_specifier", "struct_specifier"]:
-                # Find the class name
-                for child in current.children:
-                    if child.type == "type_identifier" or child.type == "identifier":
-                        return self._get_node_text(child)
-            current = current.parent
-        return None
+        return self._content_bytes[node.start_byte:node.end_byte].decode("utf8")
 
 
 def analyze_cpp_file(
@@ -553,4 +562,4 @@ def analyze_cpp_file(
         return analyzer.nodes, analyzer.call_relationships
     except Exception as e:
         logger.error(f"Error in tree-sitter C++ analysis for {file_path}: {e}", exc_info=True)
-        return [], []
\ No newline at end of file
+        return [], []
@@ -1,56 +1,86 @@
 """
 C# AST analyzer for call graph generation using tree-sitter.
 """
+import functools
 import logging
 import os
-import traceback
-from typing import List, Set, Optional, Tuple
+from typing import Dict, List, Set, Optional, Tuple
+from operator import attrgetter, itemgetter
 from pathlib import Path
 import sys
 import os
 
-from tree_sitter import Parser
-from ..setup_parser import get_parser
+from tree_sitter import Query
+from ..setup_parser import get_cached_parser, get_parser
 from ..models import Node, CallRelationship
 
 logger = logging.getLogger(__name__)
 
+# Declarations reported as methods, constructors or local functions.
+_METHOD_DECLARATION_TYPES = frozenset({
+    "method_declaration", "constructor_declaration", "local_function_statement",
+})
+
+# Base list entries naming a base class or interface, and the punctuation
+# between them.
+_BASE_TYPE_NODE_TYPES = frozenset({"identifier", "generic_name"})
+_BASE_LIST_PUNCTUATION = frozenset({":", ","})
+
+# Node types handled by _visit_node, matched in bulk by the extraction query.
+_QUERY_NODE_TYPES = (
+    "class_declaration",
+    "interface_declaration",
+    "method_declaration",
+    "constructor_declaration",
+    "local_function_statement",
+    "invocation_expression",
+    "object_creation_expression",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_query() -> Optional[Query]:
+    """Compile the C# extraction query once per process, or None if the grammar is unavailable."""
+    language = get_parser("csharp")
+    if language is None:
+        return None
+    alternatives = " ".join(f"({node_type})" for node_type in _QUERY_NODE_TYPES)
+    return Query(language, f"[{alternatives}] @node")
+
 
 class TreeSitterCSharpAnalyzer:
     def __init__(self, file_path: str, content: str, repo_path: str = None):
         self.file_path = Path(file_path)
         self.content = content
+        # Encoded once; node text and source snippets are slices of it
+        self._content_bytes = content.encode("utf8")
         self.repo_path = repo_path or ""
+        # The paths depend only on file_path and repo_path, so compute them once
+        self._relative_path = self._compute_relative_path()
+        self._module_path = sys.intern(self._compute_module_path())
+        self._module_prefix = self._module_path + "."
         self.nodes: List[Node] = []
         self.call_relationships: List[CallRelationship] = []
         
         self.top_level_nodes = {}
         
-        self.seen_relationships = set()
+        self.seen_relationships: Set[Tuple[str, str, int]] = set()
+        # Method calls awaiting resolution against the file's declarations
+        self._pending_calls: List[CallRelationship] = []
 
         try:
-            csharp_language = get_parser("csharp")
-            if csharp_language is None:
+            self.parser = get_cached_parser("csharp")
+            if self.parser is None:
                 logger.warning("C# parser not available")
-                self.parser = None
-            else:
-                self.parser = Parser()
-                try:
-                    # Try the newer API first (tree-sitter>=0.20.0)
-                    self.parser.set_language(csharp_language)
-                except AttributeError:
-                    # Fallback to older API if needed
-                    self.parser.language = csharp_language
 
         except Exception as e:
             logger.error(f"Failed to initialize C# parser: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
             self.parser = None
 
 
     def _add_relationship(self, relationship: CallRelationship) -> bool:
         rel_key = (relationship.caller, relationship.callee, relationship.call_line)
-        
+
         if rel_key not in self.seen_relationships:
             self.seen_relationships.add(rel_key)
             self.call_relationships.append(relationship)
@@ -63,110 +93,184 @@ class TreeSitterCSharpAnalyzer:
             return
 
         try:
-            tree = self.parser.parse(bytes(self.content, "utf8"))
+            tree = self.parser.parse(self._content_bytes)
             root_node = tree.root_node
 
             logger.debug(f"Parsed AST with root node type: {root_node.type}")
 
-            self._extract_functions(root_node)
-            self._extract_call_relationships(root_node)
+            self._traverse_matches(root_node, _get_query())
+            self.nodes.sort(key=attrgetter("start_line"))
+            self._resolve_call_relationships()
 
             logger.debug(
                 f"Analysis complete: {len(self.nodes)} nodes, {len(self.call_relationships)} relationships"
             )
 
         except Exception as e:
-            logger.error(f"Error analyzing C# file {self.file_path}: {e}", exc_info=True)
+            # Tracebacks are only formatted when debug logging is on
+            logger.error(
+                f"Error analyzing C# file {self.file_path}: {e}",
+                exc_info=logger.isEnabledFor(logging.DEBUG),
+            )
 
-    def _get_module_path(self) -> str:
+    def _compute_relative_path(self) -> str:
         if self.repo_path:
             try:
-                rel_path = os.path.relpath(str(self.file_path), self.repo_path)
+                return os.path.relpath(str(self.file_path), self.repo_path)
             except ValueError:
-                rel_path = str(self.file_path)
+                return str(self.file_path)
         else:
-            rel_path = str(self.file_path)
-        
+            return str(self.file_path)
+
+    def _compute_module_path(self) -> str:
+        rel_path = self._relative_path
         for ext in ['.cs']:
             if rel_path.endswith(ext):
                 rel_path = rel_path[:-len(ext)]
                 break
         return rel_path.replace('/', '.').replace('\\', '.')
 
+    def _get_module_path(self) -> str:
+        return self._module_path
+
     def _get_relative_path(self) -> str:
-        if self.repo_path:
-            try:
-                return os.path.relpath(str(self.file_path), self.repo_path)
-            except ValueError:
-                return str(self.file_path)
-        else:
-            return str(self.file_path)
+        return self._relative_path
 
     def _get_component_id(self, name: str, class_name: str = None, is_method: bool = False) -> str:
-        module_path = self._get_module_path()
-        
+        # IDs are interned so the many nodes and relationships naming the same
+        # component share one string and compare by identity in sets and dicts
         if is_method and class_name:
-            return f"{module_path}.{class_name}.{name}"
-        elif class_name and not is_method: 
-            return f"{module_path}.{name}"
-        else:  
-            return f"{module_path}.{name}"
-
-    def _extract_functions(self, node) -> None:
-        self._traverse_for_functions(node)
-        self.nodes.sort(key=lambda n: n.start_line)
-
-    def _traverse_for_functions(self, node) -> None:
-        if node.type in ["class_declaration"]:
-            cls = self._extract_class_declaration(node)
+            return sys.intern(f"{self._module_prefix}{class_name}.{name}")
+        return sys.intern(self._module_prefix + name)
+
+    def _traverse_matches(self, root, query: Query) -> None:
+        """Extract declarations and call sites from the query's captures.
+
+        The query engine finds the handled nodes in native code; they are then
+        replayed in document order through _visit_node, with the enclosing
+        class and method tracked by byte range.
+        """
+        captured = [
+            (node.start_byte, -node.end_byte, node)
+            for node in query.captures(root).get("node", ())
+        ]
+        # Outer nodes sort before the nodes they contain
+        captured.sort(key=itemgetter(0, 1))
+
+        # Stack of (end byte, current_top_level, containing_class) for the
+        # nodes that changed the context; entries are dropped once a capture
+        # lies past their end.
+        context_stack = []
+        for start_byte, _, node in captured:
+            while context_stack and context_stack[-1][0] <= start_byte:
+                context_stack.pop()
+            if context_stack:
+                _, current_top_level, containing_class = context_stack[-1]
+            else:
+                current_top_level = containing_class = None
+
+            context = self._visit_node(node, current_top_level, containing_class)
+            if context != (current_top_level, containing_class):
+                context_stack.append((node.end_byte, *context))
+
+    def _visit_node(self, node, current_top_level, containing_class):
+        """Handle a single node and return the context for its children.
+
+        current_top_level is the name of the enclosing class or method that
+        calls are attributed to, and containing_class the name of the
+        innermost enclosing class declaration.
+        """
+        node_type = node.type
+        if node_type == "class_declaration":
+            children = self._index_children(node)
+            cls = self._extract_class_declaration(node, children)
             if cls:
                 self.nodes.append(cls)
                 self.top_level_nodes[cls.name] = cls
                 
-                self._extract_methods_from_class(node, cls.name)
+                self._extract_methods_from_class(node, cls.name, children)
+
+            name_node = self._first_child(children, "identifier")
+            if name_node:
+                current_top_level = containing_class = self._get_node_text(name_node)
+                self._extract_inheritance_relationships(node, current_top_level, children)
         
-        elif node.type == "interface_declaration":
-            interface = self._extract_interface_declaration(node)
+        elif node_type == "interface_declaration":
+            children = self._index_children(node)
+            interface = self._extract_interface_declaration(node, children)
             if interface:
                 self.nodes.append(interface)
                 self.top_level_nodes[interface.name] = interface
                 
-                self._extract_methods_from_interface(node, interface.name)
+                self._extract_methods_from_interface(node, interface.name, children)
         
-        elif node.type in ["method_declaration", "constructor_declaration", "local_function_statement"]:
-            containing_class = self._find_containing_class(node)
+        elif node_type in _METHOD_DECLARATION_TYPES:
+            children = self._index_children(node)
+            # Methods declared inside a class are not reported as nodes
             if containing_class is None:
-                method = self._extract_method_declaration(node)
+                method = self._extract_method_declaration(node, children)
                 if method and self._should_include_function(method):
                     self.nodes.append(method)
                     self.top_level_nodes[method.name] = method
+
+            name_node = self._first_child(children, "identifier")
+            if name_node:
+                current_top_level = self._get_node_text(name_node)
+
+        # Look for method calls
+        elif node_type == "invocation_expression" and current_top_level:
+            call_info = self._extract_call_from_node(node, current_top_level)
+            if call_info and self._add_relationship(call_info):
+                self._pending_calls.append(call_info)
         
-        for child in node.children:
-            self._traverse_for_functions(child)
+        # Look for object instantiation
+        elif node_type == "object_creation_expression" and current_top_level:
+            callee_name = self._extract_constructor_name(node)
+            if callee_name:
+                call_info = CallRelationship(
+                    caller=self._get_component_id(current_top_level),
+                    callee=self._get_component_id(callee_name),
+                    call_line=node.start_point[0] + 1,
+                    is_resolved=False
+                )
+                self._add_relationship(call_info)
+
+        return current_top_level, containing_class
+
+    def _resolve_call_relationships(self) -> None:
+        """Mark method calls whose callee is declared in this file.
 
-    def _extract_methods_from_class(self, class_node, class_name: str) -> None:
-        class_body = self._find_child_by_type(class_node, "class_declaration")
+        Runs after the traversal so that calls to declarations appearing later
+        in the file are resolved as well.
+        """
+        prefix_len = len(self._module_prefix)
+        for relationship in self._pending_calls:
+            relationship.is_resolved = relationship.callee[prefix_len:] in self.top_level_nodes
+
+    def _extract_methods_from_class(self, class_node, class_name: str, children=None) -> None:
+        if children is None:
+            children = self._index_children(class_node)
+        class_body = self._first_child(children, "class_declaration")
         if not class_body:
             # Try to find class body differently
-            for child in class_node.children:
-                if child.type == "declaration_list":
-                    class_body = child
-                    break
+            class_body = self._first_child(children, "declaration_list")
         
         if not class_body:
             return
             
         for child in class_body.children:
-            if child.type in ["method_declaration", "constructor_declaration", "local_function_statement"]:
+            if child.type in _METHOD_DECLARATION_TYPES:
                 method_name = self._get_method_name(child)
                 if method_name:
-                    method_key = f"{self._get_module_path()}.{class_name}.{method_name}"
+                    method_key = f"{self._module_prefix}{class_name}.{method_name}"
                     method_node = self._create_method_node(child, method_name, class_name)
                     if method_node:
                         self.top_level_nodes[method_key] = method_node
 
-    def _extract_methods_from_interface(self, interface_node, interface_name: str) -> None:
-        interface_body = self._find_child_by_type(interface_node, "declaration_list")
+    def _extract_methods_from_interface(self, interface_node, interface_name: str, children=None) -> None:
+        if children is None:
+            children = self._index_children(interface_node)
+        interface_body = self._first_child(children, "declaration_list")
         if not interface_body:
             return
             
@@ -174,7 +278,7 @@ class TreeSitterCSharpAnalyzer:
             if child.type == "method_declaration":
                 method_name = self._get_method_name(child)
                 if method_name:
-                    method_key = f"{self._get_module_path()}.{interface_name}.{method_name}"
+                    method_key = f"{self._module_prefix}{interface_name}.{method_name}"
                     method_node = self._create_method_node(child, method_name, interface_name)
                     if method_node:
                         self.top_level_nodes[method_key] = method_node
@@ -192,15 +296,14 @@ class TreeSitterCSharpAnalyzer:
             line_start = node.start_point[0] + 1
             line_end = node.end_point[0] + 1
             component_id = self._get_component_id(method_name, class_name, is_method=True)
-            relative_path = self._get_relative_path()
+            relative_path = self._relative_path
             
-            return Node(
+            component = Node(
                 id=component_id,
                 name=method_name,
                 component_type="method",
                 file_path=str(self.file_path),
                 relative_path=relative_path,
-                source_code="\n".join(self.content.splitlines()[line_start - 1 : line_end]),
                 start_line=line_start,
                 end_line=line_end,
                 has_docstring=False,
@@ -212,14 +315,18 @@ class TreeSitterCSharpAnalyzer:
                 display_name=f"method {method_name}",
                 component_id=component_id
             )
+            component.set_source_span(self._content_bytes, node.start_byte, node.end_byte)
+            return component
         except Exception as e:
             logger.debug(f"Error creating method node for {method_name}: {e}")
             return None
 
-    def _extract_class_declaration(self, node) -> Optional[Node]:
+    def _extract_class_declaration(self, node, children=None) -> Optional[Node]:
         """Extract class declaration."""
         try:
-            name_node = self._find_child_by_type(node, "identifier")
+            if children is None:
+                children = self._index_children(node)
+            name_node = self._first_child(children, "identifier")
             if not name_node:
                 return None
             name = self._get_node_text(name_node)
@@ -229,26 +336,22 @@ class TreeSitterCSharpAnalyzer:
             base_classes = []
             
             # Look for base list (extends/implements)
-            for child in node.children:
-                if child.type == "base_list":
-                    for base_type in child.children:
-                        if base_type.type == "identifier" or base_type.type == "generic_name":
-                            base_name = self._get_node_text(base_type)
-                            if base_name not in [":", ","]:  # Skip punctuation
-                                base_classes.append(base_name)
-            
-            code_snippet = "\n".join(self.content.splitlines()[line_start - 1 : line_end])
+            for child in children.get("base_list", ()):
+                for base_type in child.children:
+                    if base_type.type in _BASE_TYPE_NODE_TYPES:
+                        base_name = self._get_node_text(base_type)
+                        if base_name not in _BASE_LIST_PUNCTUATION:  # Skip punctuation
+                            base_classes.append(base_name)
             
             component_id = self._get_component_id(name, is_method=False)
-            relative_path = self._get_relative_path()
+            relative_path = self._relative_path
             
-            return Node(
+            component = Node(
                 id=component_id,
                 name=name,
                 component_type="class",
                 file_path=str(self.file_path),
                 relative_path=relative_path,
-                source_code=code_snippet,
                 start_line=line_start,
                 end_line=line_end,
                 has_docstring=bool(docstring),
@@ -260,13 +363,17 @@ class TreeSitterCSharpAnalyzer:
                 display_name=f"class {name}",
                 component_id=component_id,
             )
+            component.set_source_span(self._content_bytes, node.start_byte, node.end_byte)
+            return component
         except Exception:
             return None
 
-    def _extract_interface_declaration(self, node) -> Optional[Node]:
+    def _extract_interface_declaration(self, node, children=None) -> Optional[Node]:
         """Extract interface declaration."""
         try:
-            name_node = self._find_child_by_type(node, "identifier")
+            if children is None:
+                children = self._index_children(node)
+            name_node = self._first_child(children, "identifier")
             if not name_node:
                 return None
             name = self._get_node_text(name_node)
@@ -276,26 +383,22 @@ class TreeSitterCSharpAnalyzer:
             base_classes = []
             
             # Look for base list for interfaces
-            for child in node.children:
-                if child.type == "base_list":
-                    for base_type in child.children:
-                        if base_type.type == "identifier" or base_type.type == "generic_name":
-                            base_name = self._get_node_text(base_type)
-                            if base_name not in [":", ","]:  # Skip punctuation
-                                base_classes.append(base_name)
-            
-            code_snippet = "\n".join(self.content.splitlines()[line_start - 1 : line_end])
+            for child in children.get("base_list", ()):
+                for base_type in child.children:
+                    if base_type.type in _BASE_TYPE_NODE_TYPES:
+                        base_name = self._get_node_text(base_type)
+                        if base_name not in _BASE_LIST_PUNCTUATION:  # Skip punctuation
+                            base_classes.append(base_name)
             
             component_id = self._get_component_id(name, is_method=False)
-            relative_path = self._get_relative_path()
+            relative_path = self._relative_path
             
-            return Node(
+            component = Node(
                 id=component_id,
                 name=name,
                 component_type="interface",
                 file_path=str(self.file_path),
                 relative_path=relative_path,
-                source_code=code_snippet,
                 start_line=line_start,
                 end_line=line_end,
                 has_docstring=bool(docstring),
@@ -307,27 +410,23 @@ class TreeSitterCSharpAnalyzer:
                 display_name=f"interface {name}",
                 component_id=component_id,
             )
+            component.set_source_span(self._content_bytes, node.start_byte, node.end_byte)
+            return component
         except Exception:
             return None
 
-    def _extract_method_declaration(self, node) -> Optional[Node]:
+    def _extract_method_declaration(self, node, children=None) -> Optional[Node]:
         try:
-            name_node = self._find_child_by_type(node, "identifier")
-            if not name_node:
-                # For method declarations, the name might be nested differently
-                for child in node.children:
-                    if child.type == "identifier":
-                        name_node = child
-                        break
-            
+            if children is None:
+                children = self._index_children(node)
+            name_node = self._first_child(children, "identifier")
             if not name_node:
                 return None
 
             method_name = self._get_node_text(name_node)
             line_start = node.start_point[0] + 1
             line_end = node.end_point[0] + 1
-            parameters = self._extract_parameters(node)
-            code_snippet = self._get_node_text(node)
+            parameters = self._extract_parameters(node, children)
 
             # Determine method type
             if node.type == "constructor_declaration":
@@ -341,15 +440,14 @@ class TreeSitterCSharpAnalyzer:
                 node_type = "method"
 
             component_id = self._get_component_id(method_name, is_method=False)
-            relative_path = self._get_relative_path()
+            relative_path = self._relative_path
 
-            return Node(
+            component = Node(
                 id=component_id,
                 name=method_name,
                 component_type=node_type,
                 file_path=str(self.file_path),
                 relative_path=relative_path,
-                source_code=code_snippet,
                 start_line=line_start,
                 end_line=line_end,
                 has_docstring=False,
@@ -361,6 +459,8 @@ class TreeSitterCSharpAnalyzer:
                 display_name=display_name,
                 component_id=component_id,
             )
+            component.set_source_span(self._content_bytes, node.start_byte, node.end_byte)
+            return component
         except Exception as e:
             logger.debug(f"Error extracting method declaration: {e}")
             return None
@@ -374,9 +474,12 @@ class TreeSitterCSharpAnalyzer:
 
         return True
 
-    def _extract_parameters(self, node) -> List[str]:
+    def _extract_parameters(self, node, children=None) -> List[str]:
         parameters = []
-        params_node = self._find_child_by_type(node, "parameter_list")
+        if children is None:
+            params_node = self._find_child_by_type(node, "parameter_list")
+        else:
+            params_node = self._first_child(children, "parameter_list")
         if params_node:
             for child in params_node.children:
                 if child.type == "parameter":
@@ -390,58 +493,24 @@ class TreeSitterCSharpAnalyzer:
                                 parameters.append(self._get_node_text(var_id))
         return parameters
 
-    def _extract_call_relationships(self, node) -> None:
-        current_top_level = None
-        self._traverse_for_calls(node, current_top_level)
-
-    def _traverse_for_calls(self, node, current_top_level) -> None:
-        if node.type in ["class_declaration"]:
-            name_node = self._find_child_by_type(node, "identifier")
-            if name_node:
-                current_top_level = self._get_node_text(name_node)
-                
-                # Handle inheritance relationships
-                for child in node.children:
-                    if child.type == "base_list":
-                        for base_type in child.children:
-                            if base_type.type in ["identifier", "generic_name"]:
-                                base_name = self._get_node_text(base_type)
-                                if base_name not in [":", ","]:  # Skip punctuation
-                                    caller_id = self._get_component_id(current_top_level)
-                                    callee_id = f"{self._get_module_path()}.{base_name}" 
-                                    inheritance_rel = CallRelationship(
-                                        caller=caller_id,
-                                        callee=callee_id,
-                                        call_line=node.start_point[0] + 1,
-                                        is_resolved=False
-                                    )
-                                    self._add_relationship(inheritance_rel)
-        
-        elif node.type in ["method_declaration", "constructor_declaration", "local_function_statement"]:
-            name_node = self._find_child_by_type(node, "identifier")
-            if name_node:
-                current_top_level = self._get_node_text(name_node)
-
-        # Look for method calls
-        if node.type == "invocation_expression" and current_top_level:
-            call_info = self._extract_call_from_node(node, current_top_level)
-            if call_info:
-                self._add_relationship(call_info)
-        
-        # Look for object instantiation
-        elif node.type == "object_creation_expression" and current_top_level:
-            callee_name = self._extract_constructor_name(node)
-            if callee_name:
-                call_info = CallRelationship(
-                    caller=f"{self._get_module_path()}.{current_top_level}",
-                    callee=f"{self._get_module_path()}.{callee_name}",
-                    call_line=node.start_point[0] + 1,
-                    is_resolved=False
-                )
-                self._add_relationship(call_info)
-
-        for child in node.children:
-            self._traverse_for_calls(child, current_top_level)
+    def _extract_inheritance_relationships(self, node, class_name: str, children=None) -> None:
+        """Record a relationship from a class to each type in its base list."""
+        if children is None:
+            children = self._index_children(node)
+        for child in children.get("base_list", ()):
+            for base_type in child.children:
+                if base_type.type in _BASE_TYPE_NODE_TYPES:
+                    base_name = self._get_node_text(base_type)
+                    if base_name not in _BASE_LIST_PUNCTUATION:  # Skip punctuation
+                        caller_id = self._get_component_id(class_name)
+                        callee_id = self._get_component_id(base_name)
+                        inheritance_rel = CallRelationship(
+                            caller=caller_id,
+                            callee=callee_id,
+                            call_line=node.start_point[0] + 1,
+                            is_resolved=False
+                        )
+                        self._add_relationship(inheritance_rel)
 
     def _extract_call_from_node(self, node, caller_name: str) -> Optional[CallRelationship]:
         """Extract call relationship from an invocation_expression node."""
@@ -452,22 +521,14 @@ class TreeSitterCSharpAnalyzer:
             if not callee_name:
                 return None
             
-            caller_id = f"{self._get_module_path()}.{caller_name}"
-            callee_id = f"{self._get_module_path()}.{callee_name}"
-            
-            if callee_name in self.top_level_nodes:
-                return CallRelationship(
-                    caller=caller_id,
-                    callee=callee_id,
-                    call_line=call_line,
-                    is_resolved=True,
-                )
+            caller_id = self._get_component_id(caller_name)
+            callee_id = self._get_component_id(callee_name)
             
             return CallRelationship(
                 caller=caller_id,
                 callee=callee_id,
                 call_line=call_line,
-                is_resolved=False,
+                is_resolved=False,  # Resolved once the whole file has been traversed
             )
             
         except Exception as e:
@@ -488,36 +549,31 @@ class TreeSitterCSharpAnalyzer:
         return None
 
     def _extract_callee_name(self, call_node) -> Optional[str]:
-        if not call_node.children:
-            return None
-            
         # Look for the method name in the call
         for child in call_node.children:
-            if child.type == "member_access_expression":  # obj.Method() call
-                # Get the method name from member access
+            child_type = child.type
+            if child_type == "identifier":  # Direct method call
+                return self._get_node_text(child)
+            if child_type == "member_access_expression":  # obj.Method() call
+                # The first identifier of the member access is taken, which
+                # for obj.Method() is the object
                 for subchild in child.children:
                     if subchild.type == "identifier":
-                        # This could be the object or the method name
-                        # The method name is typically the last identifier in member access
                         return self._get_node_text(subchild)
-            elif child.type == "identifier":  # Direct method call
-                return self._get_node_text(child)
-        
-        # For method calls like obj.methodName, the method name is usually after the dot
-        member_access = self._find_child_by_type(call_node, "member_access_expression")
-        if member_access:
-            for subchild in member_access.children:
-                if subchild.type == "identifier":
-                    # Get the rightmost identifier (the method name)
-                    identifiers = []
-                    for subsubchild in member_access.children:
-                        if subsubchild.type == "identifier":
-                            identifiers.append(self._get_node_text(subsubchild))
-                    if identifiers:
-                        return identifiers[-1]  # Return the last identifier (method name)
-        
         return None
 
+    def _index_children(self, node) -> Dict[str, list]:
+        """Group the children of a node by type in a single pass."""
+        index = {}
+        for child in node.children:
+            index.setdefault(child.type, []).append(child)
+        return index
+
+    def _first_child(self, children: Dict[str, list], node_type: str):
+        """Get the first child of a type from an _index_children index."""
+        matches = children.get(node_type)
+        return matches[0] if matches else None
+
     def _find_child_by_type(self, node, node_type: str):
         """Find first child node of specified type."""
         for child in node.children:
@@ -526,20 +582,7 @@ class TreeSitterCSharpAnalyzer:
         return None
 
     def _get_node_text(self, node) -> str:
-        start_byte = node.start_byte
-        end_byte = node.end_byte
-        return self.content.encode("utf8")[start_byte:end_byte].decode("utf8")
-
-    def _find_containing_class(self, method_node) -> Optional[str]:
-        """Find the containing class for a method."""
-        current = method_node.parent
-        while current:
-            if current.type == "class_declaration":
-                name_node = self._find_child_by_type(current, "identifier")
-                if name_node:
-                    return self._get_node_text(name_node)
-            current = current.parent
-        return None
+        return self._content_bytes[node.start_byte:node.end_byte].decode("utf8")
 
 
 def analyze_csharp_file(
@@ -555,5 +598,8 @@ def analyze_csharp_file(
         )
         return analyzer.nodes, analyzer.call_relationships
     except Exception as e:
-        logger.error(f"Error in tree-sitter C# analysis for {file_path}: {e}", exc_info=True)
-        return [], []
\ No newline at end of file
+        logger.error(
+            f"Error in tree-sitter C# analysis for {file_path}: {e}",
+            exc_info=logger.isEnabledFor(logging.DEBUG),
+        )
+        return [], []
@@ -1,40 +1,147 @@
+import functools
 import logging
+from collections import OrderedDict
 from typing import List, Optional, Tuple
 from pathlib import Path
 import sys
 import os
 
-from tree_sitter import Parser, Language
+from tree_sitter import Language, Query, Tree
 import tree_sitter_java
 from ..models import Node, CallRelationship
 
 logger = logging.getLogger(__name__)
 
+# Maps both path separators to the module path separator in one pass.
+_SEP_TRANS = str.maketrans({"/": ".", "\\": "."})
+
+# Node types handled by _extract_node and _extract_relationship respectively.
+_DECLARATION_TYPES = frozenset({
+	"class_declaration", "interface_declaration", "enum_declaration",
+	"record_declaration", "annotation_type_declaration", "method_declaration",
+})
+_RELATIONSHIP_TYPES = frozenset({
+	"class_declaration", "enum_declaration", "record_declaration",
+	"field_declaration", "method_invocation", "object_creation_expression",
+})
+_CONTEXT_TYPES = tuple(sorted(_DECLARATION_TYPES | _RELATIONSHIP_TYPES))
+
+# Declarations that enclose the nodes handled above. The component ID used as
+# a containing class comes from all type declarations, while the containing
+# class name used for methods excludes annotation types.
+_TYPE_DECLARATION_TYPES = frozenset({
+	"class_declaration", "interface_declaration", "enum_declaration",
+	"record_declaration", "annotation_type_declaration",
+})
+_CLASS_NAME_TYPES = frozenset({
+	"class_declaration", "interface_declaration", "enum_declaration", "record_declaration",
+})
+
+# Context of a node with no enclosing declaration:
+# (class name, class component ID, method component ID, method node, class_declaration node)
+_NO_CONTEXT = (None, None, None, None, None)
+
+# Spring request mapping annotations and the HTTP method each implies;
+# RequestMapping takes it from its method argument instead.
+_MAPPING_HTTP_METHODS = {
+	b"RequestMapping": None, b"GetMapping": "GET", b"PostMapping": "POST",
+	b"PutMapping": "PUT", b"DeleteMapping": "DELETE", b"PatchMapping": "PATCH",
+}
+_MAPPING_ANNOTATIONS = frozenset(_MAPPING_HTTP_METHODS)
+_CONTROLLER_ANNOTATIONS = frozenset({b"Controller", b"RestController"})
+# Annotation arguments holding the mapped path
+_URL_ARGUMENT_KEYS = frozenset({b"value", b"path"})
+
+# Primitive and common built-in types that are not reported as dependencies.
+_PRIMITIVE_TYPES = frozenset({
+	"boolean", "byte", "char", "double", "float", "int", "long", "short",
+	"Boolean", "Byte", "Character", "Double", "Float", "Integer", "Long", "Short",
+	"String", "Object", "List", "Set", "Map", "Collection", "Optional",
+	"void", "Void",
+})
+
+# Source and parse tree of the files analyzed with analyze_java_file_incremental,
+# by absolute path; the tree is edited and reused when the file is parsed again.
+_MAX_CACHED_TREES = 256
+_tree_cache: "OrderedDict[str, Tuple[bytes, Tree]]" = OrderedDict()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_query(node_types: Tuple[str, ...]) -> Optional[Query]:
+	"""Compile a query capturing every node of the given types, or None if the grammar is unavailable."""
+	from ..setup_parser import get_parser
+	java_language = get_parser("java")
+	if java_language is None:
+		return None
+	alternatives = " ".join(f"({node_type})" for node_type in node_types)
+	return Query(java_language, f"[{alternatives}] @node")
+
+
+def _document_order(node):
+	# Outer nodes sort before the nodes they contain
+	return node.start_byte, -node.end_byte
+
+
+def _common_prefix_length(a: bytes, b: bytes) -> int:
+	# Binary search, so that the bytes are compared by memcmp in slices
+	a, b = memoryview(a), memoryview(b)
+	low, high = 0, min(len(a), len(b))
+	while low < high:
+		mid = (low + high + 1) // 2
+		if a[:mid] == b[:mid]:
+			low = mid
+		else:
+			high = mid - 1
+	return low
+
+
+def _point_at(src: bytes, offset: int) -> Tuple[int, int]:
+	"""(row, column) of a byte offset, the column counted in bytes as tree-sitter does."""
+	return src.count(b"\n", 0, offset), offset - (src.rfind(b"\n", 0, offset) + 1)
+
+
+def _compute_edit(old_src: bytes, new_src: bytes) -> Optional[dict]:
+	"""Tree.edit arguments turning old_src into new_src, or None if they are equal.
+	
+	The edit spans everything between the common prefix and common suffix of
+	the two sources, so it is correct for any change, however it was made.
+	"""
+	if old_src == new_src:
+		return None
+	start = _common_prefix_length(old_src, new_src)
+	# The suffix may not overlap the prefix in either source
+	max_suffix = min(len(old_src), len(new_src)) - start
+	suffix = _common_prefix_length(old_src[::-1][:max_suffix], new_src[::-1][:max_suffix])
+	old_end = len(old_src) - suffix
+	new_end = len(new_src) - suffix
+	return {
+		"start_byte": start,
+		"old_end_byte": old_end,
+		"new_end_byte": new_end,
+		"start_point": _point_at(old_src, start),
+		"old_end_point": _point_at(old_src, old_end),
+		"new_end_point": _point_at(new_src, new_end),
+	}
+
 class TreeSitterJavaAnalyzer:
-	def __init__(self, file_path: str, content: str, repo_path: str = None):
+	def __init__(self, file_path: str, content: str, repo_path: str = None, old_tree: Optional[Tree] = None):
 		self.file_path = Path(file_path)
 		self.content = content
+		# Encoded once; node text and source snippets are slices of it
+		self._src = content.encode("utf8")
 		self.repo_path = repo_path or ""
+		# The paths depend only on file_path and repo_path, so compute them once
+		self._relative_path = self._compute_relative_path()
+		self._module_path = sys.intern(self._compute_module_path())
+		self._module_prefix = self._module_path + "."
 		self.nodes: List[Node] = []
 		self.call_relationships: List[CallRelationship] = []
+		# Previous tree of the file, already edited to match content
+		self._old_tree = old_tree
+		self.tree: Optional[Tree] = None
 		self._analyze()
 	
-	def _get_module_path(self) -> str:
-		if self.repo_path:
-			try:
-				rel_path = os.path.relpath(str(self.file_path), self.repo_path)
-			except ValueError:
-				rel_path = str(self.file_path)
-		else:
-			rel_path = str(self.file_path)
-		
-		for ext in ['.java']:
-			if rel_path.endswith(ext):
-				rel_path = rel_path[:-len(ext)]
-				break
-		return rel_path.replace('/', '.').replace('\\', '.')
-	
-	def _get_relative_path(self) -> str:
+	def _compute_relative_path(self) -> str:
 		"""Get relative path from repo root."""
 		if self.repo_path:
 			try:
@@ -44,62 +151,157 @@ class TreeSitterJavaAnalyzer:
 		else:
 			return str(self.file_path)
 	
+	def _compute_module_path(self) -> str:
+		rel_path = self._relative_path
+		if rel_path.endswith(".java"):
+			rel_path = rel_path[:-len(".java")]
+		return rel_path.translate(_SEP_TRANS)
+	
+	def _get_module_path(self) -> str:
+		return self._module_path
+	
+	def _get_relative_path(self) -> str:
+		"""Get relative path from repo root."""
+		return self._relative_path
+	
 	def _get_component_id(self, name: str, parent_class: str = None) -> str:
-		module_path = self._get_module_path()
+		# IDs repeat across nodes and relationships, so share one string per ID
 		if parent_class:
-			return f"{module_path}.{parent_class}.{name}"
+			return sys.intern(f"{self._module_prefix}{parent_class}.{name}")
 		else:
-			return f"{module_path}.{name}"
+			return sys.intern(self._module_prefix + name)
 
 	def _analyze(self):
-		from ..setup_parser import get_parser
-		java_language = get_parser("java")
-		if java_language is None:
+		from ..setup_parser import get_cached_parser
+		parser = get_cached_parser("java")
+		if parser is None:
 			logger.warning("Java parser not available")
 			return
 		
-		parser = Parser(java_language)
-		
-		tree = parser.parse(bytes(self.content, "utf8"))
-		self.root_node = tree.root_node  # Store root node for later use
-		lines = self.content.splitlines()
+		if self._old_tree is not None:
+			# Unchanged subtrees of the previous parse are reused
+			self.tree = parser.parse(self._src, self._old_tree)
+		else:
+			self.tree = parser.parse(self._src)
+		self.root_node = self.tree.root_node  # Store root node for later use
 		
 		top_level_nodes = {}
+		# First class declaration with each name, in document order
+		self._class_nodes = {}
+		# (is controller, path prefix) of each class declaration with methods
+		self._class_mappings = {}
+		self._method_variables = {}
+		self._class_fields = {}
+		# Calls on an object, resolved once every declaration is known
+		self._pending_calls = []
 		
-		self._extract_nodes(self.root_node, top_level_nodes, lines)
+		self._extract(top_level_nodes)
+		self._resolve_calls(top_level_nodes)
+	
+	def _find_nodes(self, node_types: Tuple[str, ...]) -> list:
+		"""Get every node of the given types in document order, matched by a compiled query."""
+		found = _get_query(node_types).captures(self.root_node).get("node", [])
+		found.sort(key=_document_order)
+		return found
+	
+	def _extract(self, top_level_nodes):
+		"""Extract nodes and relationships in a single pass over the tree.
 		
-		self._extract_relationships(self.root_node, top_level_nodes)
+		The handled nodes are visited once in document order while a stack of
+		enclosing declarations is kept by byte range, so the enclosing class and
+		method of every node are recorded as it is reached and the
+		_find_containing_* helpers are dict lookups instead of parent walks.
+		"""
+		self._enclosing = {}
+		# Stack of (end byte, context) for the enclosing declarations
+		scopes = []
+		for node in self._find_nodes(_CONTEXT_TYPES):
+			while scopes and scopes[-1][0] <= node.start_byte:
+				scopes.pop()
+			context = scopes[-1][1] if scopes else _NO_CONTEXT
+			self._enclosing[node] = context
+			
+			node_type = node.type
+			if node_type in _DECLARATION_TYPES:
+				self._extract_node(node, top_level_nodes)
+			if node_type in _RELATIONSHIP_TYPES:
+				self._extract_relationship(node, top_level_nodes)
+			
+			if node_type in _TYPE_DECLARATION_TYPES or node_type == "method_declaration":
+				scopes.append((node.end_byte, self._enter_declaration(node, context)))
 	
-	def _extract_nodes(self, node, top_level_nodes, lines):
+	def _resolve_calls(self, top_level_nodes):
+		"""Fill in the relationships of calls on an object once all declarations are known.
+		
+		Each call holds a placeholder in call_relationships so the relationships
+		keep document order; calls whose target type is unknown or built-in are
+		dropped.
+		"""
+		if not self._pending_calls:
+			return
+		
+		for index, node, object_name, caller_id in self._pending_calls:
+			if object_name in top_level_nodes:
+				target_type = sys.intern(object_name)
+			else:
+				target_type = self._find_variable_type(node, object_name, top_level_nodes)
+			
+			if target_type and not self._is_primitive_type(target_type):
+				self.call_relationships[index] = CallRelationship(
+					caller=caller_id,
+					callee=target_type,
+					call_line=node.start_point[0]+1,
+					is_resolved=False
+				)
+		self.call_relationships = [rel for rel in self.call_relationships if rel is not None]
+	
+	def _enter_declaration(self, node, context):
+		"""Get the context for the nodes inside a type or method declaration."""
+		class_name, class_id, method_id, method_node, class_node = context
+		name = self._get_identifier_name(node)
+		
+		if node.type == "method_declaration":
+			method_node = node
+			# Methods outside any named class leave the outer method in effect
+			if name and class_name:
+				method_id = self._get_component_id(f"{class_name}.{name}")
+			return class_name, class_id, method_id, method_node, class_node
+		
+		if node.type == "class_declaration":
+			class_node = node
+		if name:
+			class_id = self._get_component_id(name)
+			if node.type in _CLASS_NAME_TYPES:
+				class_name = name
+		return class_name, class_id, method_id, method_node, class_node
+	
+	def _extract_node(self, node, top_level_nodes):
 		node_type = None
 		node_name = None
 		
 		if node.type == "class_declaration":
-			is_abstract = any(c.type == "modifier" and c.text.decode() == "abstract" for c in node.children)
+			modifiers = self._get_modifiers(node)
+			is_abstract = modifiers is not None and any(c.type == "abstract" for c in modifiers.children)
 			node_type = "abstract class" if is_abstract else "class"
-			name_node = next((c for c in node.children if c.type == "identifier"), None)
-			node_name = name_node.text.decode() if name_node else None
+			node_name = self._get_identifier_name(node)
+			if node_name:
+				self._class_nodes.setdefault(node_name, node)
 		elif node.type == "interface_declaration":
 			node_type = "interface"
-			name_node = next((c for c in node.children if c.type == "identifier"), None)
-			node_name = name_node.text.decode() if name_node else None
+			node_name = self._get_identifier_name(node)
 		elif node.type == "enum_declaration":
 			node_type = "enum"
-			name_node = next((c for c in node.children if c.type == "identifier"), None)
-			node_name = name_node.text.decode() if name_node else None
+			node_name = self._get_identifier_name(node)
 		elif node.type == "record_declaration":
 			node_type = "record"
-			name_node = next((c for c in node.children if c.type == "identifier"), None)
-			node_name = name_node.text.decode() if name_node else None
+			node_name = self._get_identifier_name(node)
 		elif node.type == "annotation_type_declaration":
 			node_type = "annotation"
-			name_node = next((c for c in node.children if c.type == "identifier"), None)
-			node_name = name_node.text.decode() if name_node else None
+			node_name = self._get_identifier_name(node)
 		elif node.type == "method_declaration":
 			node_type = "method"
-			name_node = next((c for c in node.children if c.type == "identifier"), None)
-			if name_node:
-				method_name = name_node.text.decode()
+			method_name = self._get_identifier_name(node)
+			if method_name:
 				containing_class = self._find_containing_class_name(node)
 				if containing_class:
 					node_name = f"{containing_class}.{method_name}"
@@ -112,28 +314,27 @@ class TreeSitterJavaAnalyzer:
 			http_method = None
 			if node.type == "method_declaration":
 				containing_class_name = self._find_containing_class_name(node)
-				logger.debug(f"Processing method in class: {containing_class_name}")
+				logger.debug("Processing method in class: %s", containing_class_name)
 				is_controller = False
 				class_path_prefix = None
 				if containing_class_name:
 					# Check for Controller annotation in the class itself
-					class_node = self._find_class_node_by_name(containing_class_name)
+					class_node = self._class_nodes.get(containing_class_name)
 					if class_node:
-						is_controller = self._is_controller_class(class_node)
-						logger.debug(f"Class {containing_class_name} {'is' if is_controller else 'is not'} a Controller based on annotations")
-						# Extract path prefix from class annotations
-						class_path_prefix = self._extract_path_prefix_from_class_annotations(class_node)
+						# Annotations and path prefix are read once per class
+						is_controller, class_path_prefix = self._get_class_mapping(class_node)
+						logger.debug("Class %s %s a Controller based on annotations", containing_class_name, 'is' if is_controller else 'is not')
 						if class_path_prefix:
-							logger.debug(f"Found class path prefix: {class_path_prefix}")
+							logger.debug("Found class path prefix: %s", class_path_prefix)
 								
 					if not is_controller:
 						# Fallback: Check if class name contains 'Controller'
 						if 'Controller' in containing_class_name or 'controller' in containing_class_name:
 							is_controller = True
-							logger.debug(f"Class {containing_class_name} identified as Controller based on name")
+							logger.debug("Class %s identified as Controller based on name", containing_class_name)
 							
 				if is_controller:
-					logger.debug(f"Found Controller class: {containing_class_name}, extracting API URL")
+					logger.debug("Found Controller class: %s, extracting API URL", containing_class_name)
 					api_url, http_method = self._extract_api_url_from_annotations(node)
 					# Prepend class path prefix if both exist
 					if api_url and class_path_prefix:
@@ -144,9 +345,9 @@ class TreeSitterJavaAnalyzer:
 							api_url = class_path_prefix + '/' + api_url
 						else:
 							api_url = class_path_prefix + api_url
-						logger.debug(f"Combined API URL with class prefix: {api_url}")
+						logger.debug("Combined API URL with class prefix: %s", api_url)
 				else:
-					logger.debug(f"Class {containing_class_name} is not a Controller, skipping API URL extraction")
+					logger.debug("Class %s is not a Controller, skipping API URL extraction", containing_class_name)
 			
 			component_id = self._get_component_id(node_name)
 			relative_path = self._get_relative_path()
@@ -156,7 +357,6 @@ class TreeSitterJavaAnalyzer:
 				component_type=node_type,
 				file_path=str(self.file_path),
 				relative_path=relative_path,
-				source_code="\n".join(lines[node.start_point[0]:node.end_point[0]+1]),
 				start_line=node.start_point[0]+1,
 				end_line=node.end_point[0]+1,
 				has_docstring=False,
@@ -171,111 +371,70 @@ class TreeSitterJavaAnalyzer:
 				api_url=api_url,
 				http_method=http_method
 			)
+			# Decoded from the shared file bytes only if the source is read
+			node_obj.set_source_span(self._src, node.start_byte, node.end_byte)
 			self.nodes.append(node_obj)
 			top_level_nodes[node_name] = node_obj
-		
-		# Recursively process children
-		for child in node.children:
-			self._extract_nodes(child, top_level_nodes, lines)
 	
 	def _extract_api_url_from_annotations(self, method_node):
 		"""Extract API URL and HTTP method from method annotations like @RequestMapping, @GetMapping, @PostMapping, etc."""
-		logger.debug(f"Extracting API URL from method: {method_node.text.decode()[:100]}...")
+		# Guarded because the whole method would be decoded just to be truncated
+		if logger.isEnabledFor(logging.DEBUG):
+			logger.debug("Extracting API URL from method: %s...", self._text(method_node)[:100])
 		
 		# Check modifiers of the method node for annotations (this is where annotations like @PostMapping are located)
-		for child in method_node.children:
-			if child.type == "modifiers":
-				logger.debug(f"Found modifiers: {child.text.decode()[:100]}...")
-				for modifier_child in child.children:
-					if modifier_child.type == "annotation":
-						logger.debug(f"Found annotation in modifiers: {modifier_child.text.decode()}")
-						url, http_method = self._parse_annotation_for_url(modifier_child)
+		modifiers = self._get_modifiers(method_node)
+		if modifiers is not None:
+			if logger.isEnabledFor(logging.DEBUG):
+				logger.debug("Found modifiers: %s...", self._text(modifiers)[:100])
+			for modifier_child in modifiers.children:
+				if modifier_child.type == "annotation":
+					logger.debug("Found annotation in modifiers: %s", self._text(modifier_child))
+					url, http_method = self._parse_annotation_for_url(modifier_child)
+					if url:
+						logger.debug("Extracted URL from annotation: %s, HTTP method: %s", url, http_method)
+						return url, http_method
+		
+		# Also check the preceding siblings for annotations that might precede the method
+		sibling = method_node.prev_sibling
+		while sibling is not None:
+			logger.debug("Checking preceding sibling of type: %s", sibling.type)
+			if sibling.type == "annotation":
+				logger.debug("Found annotation: %s", self._text(sibling))
+				url, http_method = self._parse_annotation_for_url(sibling)
+				if url:
+					logger.debug("Extracted URL from annotation: %s, HTTP method: %s", url, http_method)
+					return url, http_method
+			# If sibling is a class_body, look for annotations inside it
+			elif sibling.type == "class_body":
+				for sub_child in sibling.children:
+					if sub_child.type == "annotation":
+						logger.debug("Found annotation in class body: %s", self._text(sub_child))
+						url, http_method = self._parse_annotation_for_url(sub_child)
 						if url:
-							logger.debug(f"Extracted URL from annotation: {url}, HTTP method: {http_method}")
+							logger.debug("Extracted URL from annotation: %s, HTTP method: %s", url, http_method)
 							return url, http_method
-					elif modifier_child.type == "marker_annotation":
-						# Handle marker annotations like @RequestBody
-						for marker_child in modifier_child.children:
-							if marker_child.type == "annotation":
-								logger.debug(f"Found annotation in marker annotation: {marker_child.text.decode()}")
-								url, http_method = self._parse_annotation_for_url(marker_child)
-								if url:
-									logger.debug(f"Extracted URL from annotation: {url}, HTTP method: {http_method}")
-		
-		# Also check the parent node for annotations that might precede the method
-		parent = method_node.parent
-		if parent:
-			logger.debug(f"Parent node type: {parent.type}")
-			# Get siblings of the method node (before the method itself)
-			for i, child in enumerate(parent.children):
-				if child == method_node:
-					logger.debug(f"Found method node at index {i}")
-					# Look at preceding nodes for annotations
-					for j in range(i-1, -1, -1):
-						sibling = parent.children[j]
-						logger.debug(f"Checking sibling {j} with type: {sibling.type}")
-						if sibling.type == "annotation":
-							logger.debug(f"Found annotation: {sibling.text.decode()}")
-							url, http_method = self._parse_annotation_for_url(sibling)
-							if url:
-								logger.debug(f"Extracted URL from annotation: {url}, HTTP method: {http_method}")
-								return url, http_method
-						# If sibling is a class_body, look for annotations inside it
-						elif sibling.type == "class_body":
-							for sub_child in sibling.children:
-								if sub_child.type == "annotation":
-									logger.debug(f"Found annotation in class body: {sub_child.text.decode()}")
-									url, http_method = self._parse_annotation_for_url(sub_child)
-									if url:
-										logger.debug(f"Extracted URL from annotation: {url}, HTTP method: {http_method}")
-										return url, http_method
-					break
+			sibling = sibling.prev_sibling
 		logger.debug("No URL found in annotations for method")
 		return None, None
 	
 	def _parse_annotation_for_url(self, annotation_node):
 		"""Parse annotation to extract URL path and HTTP method."""
-		logger.debug(f"Parsing annotation node: {annotation_node.text.decode()}")
-		annotation_name = None
-		
-		# Find the annotation name
-		for child in annotation_node.children:
-			if child.type == "identifier":
-				annotation_name = child.text.decode()
-				logger.debug(f"Found annotation name: {annotation_name}")
-				break
-		
-		is_spring_annotation = False
-		processed_annotation_name = None
-		
-		if annotation_name and annotation_name in ["RequestMapping", "GetMapping", "PostMapping", "PutMapping", "DeleteMapping", "PatchMapping"]:
-			logger.debug(f"Processing Spring annotation: {annotation_name}")
-			is_spring_annotation = True
-			processed_annotation_name = annotation_name
+		logger.debug("Parsing annotation node: %s", self._text(annotation_node))
+		# The name is only matched when it is a plain identifier, so it is
+		# compared as raw bytes without decoding
+		annotation_name = self._get_name_bytes(annotation_node)
+		is_spring_annotation = annotation_name in _MAPPING_ANNOTATIONS
+		if is_spring_annotation:
+			logger.debug("Processing Spring annotation: %s", annotation_name.decode())
 		elif annotation_name:
-			# Check if annotation ends with the expected names (handles full package names like org.springframework.web.bind.annotation.GetMapping)
-			trimmed_annotation = annotation_name.split('.')[-1]  # Get the last part after dots
-			if trimmed_annotation in ["RequestMapping", "GetMapping", "PostMapping", "PutMapping", "DeleteMapping", "PatchMapping"]:
-				logger.debug(f"Processing Spring annotation: {trimmed_annotation}")
-				is_spring_annotation = True
-				processed_annotation_name = trimmed_annotation
-			else:
-				logger.debug(f"Annotation {annotation_name} is not a Spring mapping annotation")
+			logger.debug("Annotation %s is not a Spring mapping annotation", annotation_name.decode())
 		
 		# Determine HTTP method based on annotation name
 		http_method = None
-		if processed_annotation_name:
-			if processed_annotation_name == "GetMapping":
-				http_method = "GET"
-			elif processed_annotation_name == "PostMapping":
-				http_method = "POST"
-			elif processed_annotation_name == "PutMapping":
-				http_method = "PUT"
-			elif processed_annotation_name == "DeleteMapping":
-				http_method = "DELETE"
-			elif processed_annotation_name == "PatchMapping":
-				http_method = "PATCH"
-			elif processed_annotation_name == "RequestMapping":
+		if is_spring_annotation:
+			http_method = _MAPPING_HTTP_METHODS[annotation_name]
+			if http_method is None:
 				# For RequestMapping, we need to check the 'method' parameter first
 				request_method = self._extract_method_from_request_mapping(annotation_node)
 				if request_method:
@@ -287,88 +446,89 @@ class TreeSitterJavaAnalyzer:
 		url = None
 		# Look for arguments in the annotation if it's a Spring mapping annotation
 		if is_spring_annotation:
-			for child in annotation_node.children:
-				if child.type == "annotation_argument_list":
-					logger.debug(f"Found annotation argument list with {len(child.children)} children")
-					for arg in child.children:
-						logger.debug(f"Processing argument of type: {arg.type}")
-						if arg.type == "element_value_pair":
-							# Process the element_value_pair which contains both key and value
-							key_node = None
-							value_node = None
-							for sub_child in arg.children:
-								if sub_child.type == "identifier":
-									key_node = sub_child
-								elif sub_child.type in ["string_literal", "field_access", "identifier", "element_value_array_initializer"]:
-									value_node = sub_child
-							
-							if key_node:
-								key_text = key_node.text.decode()
-								logger.debug(f"Found key node: {key_text}")
-								if key_text in ["value", "path"] and value_node and value_node.type == "string_literal":
-									# Remove quotes from the string literal
-									text = value_node.text.decode()
-									logger.debug(f"Found string literal: {text}")
-									if text.startswith('"') and text.endswith('"'):
-										url = text[1:-1]
-										logger.debug(f"Extracted URL: {url}")
-								# Handle method parameter in RequestMapping
-								elif key_text == "method" and value_node:
-									# This handles cases like method = RequestMethod.POST
-									if value_node.type == "field_access":
-										# For field_access like RequestMethod.POST, get the full text
-										method_text = value_node.text.decode()
-										logger.debug(f"Found method parameter with field access: {method_text}")
-										if "POST" in method_text:
-											http_method = "POST"
-										elif "GET" in method_text:
-											http_method = "GET"
-										elif "PUT" in method_text:
-											http_method = "PUT"
-										elif "DELETE" in method_text:
-											http_method = "DELETE"
-										elif "PATCH" in method_text:
-											http_method = "PATCH"
-									elif value_node.type == "identifier":
-										# For simple identifier
-										method_text = value_node.text.decode()
-										logger.debug(f"Found method parameter: {method_text}")
-										if "POST" in method_text:
-											http_method = "POST"
-										elif "GET" in method_text:
-											http_method = "GET"
-										elif "PUT" in method_text:
-											http_method = "PUT"
-										elif "DELETE" in method_text:
-											http_method = "DELETE"
-										elif "PATCH" in method_text:
-											http_method = "PATCH"
-						elif arg.type == "string_literal" and url is None:
-							# Direct string argument (like @GetMapping("/path")) - only set URL if not already found
-							text = arg.text.decode()
-							logger.debug(f"Found direct string argument: {text}")
-							if text.startswith('"') and text.endswith('"'):
-								url = text[1:-1]
-								logger.debug(f"Extracted direct URL: {url}")
-		else:
-			logger.debug(f"Annotation {annotation_name} is not a Spring mapping annotation")
+			arguments = annotation_node.child_by_field_name("arguments")
+			if arguments is not None:
+				logger.debug("Found annotation argument list with %s children", arguments.child_count)
+				for arg in arguments.children:
+					logger.debug("Processing argument of type: %s", arg.type)
+					if arg.type == "element_value_pair":
+						# Process the element_value_pair which contains both key and value
+						key_node = arg.child_by_field_name("key")
+						value_node = arg.child_by_field_name("value")
+						
+						if key_node:
+							key_text = self._src[key_node.start_byte:key_node.end_byte]
+							logger.debug("Found key node: %s", key_text.decode())
+							if key_text in _URL_ARGUMENT_KEYS and value_node and value_node.type == "string_literal":
+								url = self._string_value(value_node)
+								logger.debug("Extracted URL: %s", url)
+							# Handle method parameter in RequestMapping
+							elif key_text == b"method" and value_node:
+								# This handles cases like method = RequestMethod.POST
+								if value_node.type == "field_access":
+									# For field_access like RequestMethod.POST, get the full text
+									method_text = self._text(value_node)
+									logger.debug("Found method parameter with field access: %s", method_text)
+									if "POST" in method_text:
+										http_method = "POST"
+									elif "GET" in method_text:
+										http_method = "GET"
+									elif "PUT" in method_text:
+										http_method = "PUT"
+									elif "DELETE" in method_text:
+										http_method = "DELETE"
+									elif "PATCH" in method_text:
+										http_method = "PATCH"
+								elif value_node.type == "identifier":
+									# For simple identifier
+									method_text = self._text(value_node)
+									logger.debug("Found method parameter: %s", method_text)
+									if "POST" in method_text:
+										http_method = "POST"
+									elif "GET" in method_text:
+										http_method = "GET"
+									elif "PUT" in method_text:
+										http_method = "PUT"
+									elif "DELETE" in method_text:
+										http_method = "DELETE"
+									elif "PATCH" in method_text:
+										http_method = "PATCH"
+					elif arg.type == "string_literal" and url is None:
+						# Direct string argument (like @GetMapping("/path")) - only set URL if not already found
+						url = self._string_value(arg)
+						logger.debug("Extracted direct URL: %s", url)
 		
-		logger.debug(f"Final result - URL: {url}, HTTP method: {http_method}")
+		logger.debug("Final result - URL: %s, HTTP method: %s", url, http_method)
 		return url, http_method
 
 	def _extract_method_from_request_mapping(self, annotation_node):
 		"""Extract HTTP method from RequestMapping annotation's method parameter."""
-		for child in annotation_node.children:
-			if child.type == "annotation_argument_list":
-				for arg in child.children:
-					if arg.type == "element_value_pair":
-						key_node = next((c for c in arg.children if c.type == "identifier"), None)
-						if key_node and key_node.text.decode() == "method":
-							# Handle both single value and array values
-							value_node = next((c for c in arg.children if c.type in ["field_access", "identifier", "element_value_array_initializer"]), None)
-							if value_node:
-								if value_node.type == "field_access" or value_node.type == "identifier":
-									method_text = value_node.text.decode()
+		arguments = annotation_node.child_by_field_name("arguments")
+		if arguments is not None:
+			for arg in arguments.children:
+				if arg.type == "element_value_pair":
+					key_node = arg.child_by_field_name("key")
+					if key_node and self._src[key_node.start_byte:key_node.end_byte] == b"method":
+						# Handle both single value and array values
+						value_node = arg.child_by_field_name("value")
+						if value_node:
+							if value_node.type == "field_access" or value_node.type == "identifier":
+								method_text = self._text(value_node)
+								if "POST" in method_text:
+									return "POST"
+								elif "GET" in method_text:
+									return "GET"
+								elif "PUT" in method_text:
+									return "PUT"
+								elif "DELETE" in method_text:
+									return "DELETE"
+								elif "PATCH" in method_text:
+									return "PATCH"
+							elif value_node.type == "element_value_array_initializer":
+								# For arrays, just return the first method
+								first_method = next((c for c in value_node.children if c.type in ["field_access", "identifier"]), None)
+								if first_method:
+									method_text = self._text(first_method)
 									if "POST" in method_text:
 										return "POST"
 									elif "GET" in method_text:
@@ -379,30 +539,14 @@ class TreeSitterJavaAnalyzer:
 										return "DELETE"
 									elif "PATCH" in method_text:
 										return "PATCH"
-								elif value_node.type == "element_value_array_initializer":
-									# For arrays, just return the first method
-									first_method = next((c for c in value_node.children if c.type in ["field_access", "identifier"]), None)
-									if first_method:
-										method_text = first_method.text.decode()
-										if "POST" in method_text:
-											return "POST"
-										elif "GET" in method_text:
-											return "GET"
-										elif "PUT" in method_text:
-											return "PUT"
-										elif "DELETE" in method_text:
-											return "DELETE"
-										elif "PATCH" in method_text:
-											return "PATCH"
 		return None
 
-	def _extract_relationships(self, node, top_level_nodes):
+	def _extract_relationship(self, node, top_level_nodes):
 		# 1. Inheritance: Class extends another class
 		if node.type == "class_declaration":
 			class_name = self._get_identifier_name(node)
-			children_types = [c.type for c in node.children]
 			
-			extends_node = next((c for c in node.children if c.type == "superclass"), None)
+			extends_node = node.child_by_field_name("superclass")
 			if extends_node:
 				base_class_name = self._get_type_name(extends_node)
 				if class_name and base_class_name and not self._is_primitive_type(base_class_name):
@@ -415,12 +559,12 @@ class TreeSitterJavaAnalyzer:
 						is_resolved=False  
 					))
 			else:
-				logger.debug(f"   No superclass found for {class_name}")
+				logger.debug("   No superclass found for %s", class_name)
 		
 		# 2. Interface Implementation: Class/enum/record implements interface
 		if node.type in ["class_declaration", "enum_declaration", "record_declaration"]:
 			implementer_name = self._get_identifier_name(node)
-			implements_node = next((c for c in node.children if c.type == "super_interfaces"), None)
+			implements_node = node.child_by_field_name("interfaces")
 			if implements_node and implementer_name:
 				for child in implements_node.children:
 					if child.type == "type_list":
@@ -440,7 +584,7 @@ class TreeSitterJavaAnalyzer:
 		# 3. Field Type Use: Class has field of another class/interface type
 		if node.type == "field_declaration":
 			containing_class = self._find_containing_class(node, top_level_nodes)
-			type_node = next((c for c in node.children if c.type in ["type_identifier", "generic_type"]), None)
+			type_node = self._get_class_type_node(node)
 			if containing_class and type_node:
 				field_type_name = self._get_type_name(type_node)
 				if field_type_name and not self._is_primitive_type(field_type_name):
@@ -459,36 +603,24 @@ class TreeSitterJavaAnalyzer:
 				object_name = None
 				method_name = None
 				
-				if node.children:
-					first_child = node.children[0]
-					if first_child.type == "identifier":
-						object_name = first_child.text.decode()
-						if len(node.children) >= 3:  
-							method_child = node.children[2]
-							if method_child.type == "identifier":
-								method_name = method_child.text.decode()
+				# Only plain `object.method(...)` calls, without type arguments
+				object_node = node.child_by_field_name("object")
+				if object_node is not None and object_node.type == "identifier":
+					object_name = self._text(object_node)
+					method_child = node.child(2)
+					if method_child is not None and method_child.type == "identifier":
+						method_name = self._text(method_child)
 				
 				if object_name and method_name:
-					target_type = None						
 					caller_id = containing_method or containing_class
-						
-					if object_name in top_level_nodes:
-						target_type = object_name
-					else:
-						target_type = self._find_variable_type(node, object_name, top_level_nodes)
-
-					if target_type and not self._is_primitive_type(target_type):
-						self.call_relationships.append(CallRelationship(
-							caller=caller_id,
-							callee=target_type,
-							call_line=node.start_point[0]+1,
-							is_resolved=False
-						))
+					# The object may name a class declared further down the file
+					self._pending_calls.append((len(self.call_relationships), node, object_name, caller_id))
+					self.call_relationships.append(None)
 		
 		# 5. Object Creation
 		if node.type == "object_creation_expression":
 			containing_class = self._find_containing_class(node, top_level_nodes)
-			type_node = next((c for c in node.children if c.type in ["type_identifier", "generic_type"]), None)
+			type_node = self._get_class_type_node(node)
 			if containing_class and type_node:
 				created_type = self._get_type_name(type_node)
 				if created_type and not self._is_primitive_type(created_type):
@@ -498,220 +630,227 @@ class TreeSitterJavaAnalyzer:
 						call_line=node.start_point[0]+1,
 						is_resolved=False
 					))
-		
-		# Recursively process children
-		for child in node.children:
-			self._extract_relationships(child, top_level_nodes)
+	
+	def _text(self, node) -> str:
+		"""Get the source text of a node."""
+		return self._src[node.start_byte:node.end_byte].decode("utf8")
+	
+	def _string_value(self, node) -> str:
+		"""Get the contents of a string_literal node without its quotes."""
+		# A string literal always starts and ends with a quote character
+		return self._src[node.start_byte + 1:node.end_byte - 1].decode("utf8")
 	
 	def _is_primitive_type(self, type_name: str) -> bool:
 		"""Check if type is a Java primitive or common built-in type."""
-		primitives = {
-			"boolean", "byte", "char", "double", "float", "int", "long", "short",
-			"Boolean", "Byte", "Character", "Double", "Float", "Integer", "Long", "Short",
-			"String", "Object", "List", "Set", "Map", "Collection", "Optional",
-			"void", "Void"
-		}
-		return type_name in primitives
+		return type_name in _PRIMITIVE_TYPES
+	
+	def _get_name_bytes(self, node):
+		"""Get the raw bytes of a node's name, if it is a plain identifier."""
+		name_node = node.child_by_field_name("name")
+		if name_node is None or name_node.type != "identifier":
+			return None
+		return self._src[name_node.start_byte:name_node.end_byte]
 	
 	def _get_identifier_name(self, node):
 		"""Get identifier name from a node."""
-		name_node = next((c for c in node.children if c.type == "identifier"), None)
-		return name_node.text.decode() if name_node else None
+		name_node = node.child_by_field_name("name")
+		return self._text(name_node) if name_node is not None and name_node.type == "identifier" else None
 	
 	def _get_type_name(self, node):
-		"""Get type name from a type node."""
+		"""Get type name from a type node.
+		
+		Type names are interned, since the same few types are referenced
+		throughout a file and end up as relationship callees.
+		"""
 		if node.type == "type_identifier":
-			return node.text.decode()
-		elif node.type == "generic_type":
-			type_node = next((c for c in node.children if c.type == "type_identifier"), None)
-			return type_node.text.decode() if type_node else None
-		elif node.type == "superclass":
-			type_node = next((c for c in node.children if c.type == "type_identifier"), None)
-			return type_node.text.decode() if type_node else None
+			return sys.intern(self._text(node))
+		elif node.type == "generic_type" or node.type == "superclass":
+			type_node = node.named_child(0)
+			return sys.intern(self._text(type_node)) if type_node is not None and type_node.type == "type_identifier" else None
 		return None
 	
+	def _get_class_type_node(self, node):
+		"""Get the declared type of a field or created object, if it names a class."""
+		type_node = node.child_by_field_name("type")
+		return type_node if type_node is not None and type_node.type in ("type_identifier", "generic_type") else None
+	
+	def _get_modifiers(self, node):
+		"""Get the modifiers node of a declaration, if any."""
+		first_child = node.child(0)
+		return first_child if first_child is not None and first_child.type == "modifiers" else None
+	
 	def _find_containing_class(self, node, top_level_nodes):
-		current = node.parent
-		while current:
-			if current.type in ["class_declaration", "interface_declaration", "enum_declaration", "record_declaration", "annotation_type_declaration"]:
-				class_name = self._get_identifier_name(current)
-				if class_name and class_name in top_level_nodes:
-					return self._get_component_id(class_name)  
-			current = current.parent
-		return None
+		return self._enclosing[node][1]
 	
 	def _find_variable_type(self, node, variable_name, top_level_nodes):
-		method_node = node.parent
-		while method_node and method_node.type != "method_declaration":
-			method_node = method_node.parent
+		_, _, _, method_node, class_node = self._enclosing[node]
 		
 		if method_node:
-			for child in method_node.children:
-				if child.type == "block":
-					variable_type = self._search_variable_declaration(child, variable_name)
-					if variable_type:
-						return variable_type
+			variable_type = self._get_method_variables(method_node).get(variable_name)
+			if variable_type:
+				return variable_type
 		
-		class_node = node.parent
-		while class_node and class_node.type != "class_declaration":
-			class_node = class_node.parent
-			
 		if class_node:
-			for child in class_node.children:
-				if child.type == "class_body":
-					for body_child in child.children:
-						if body_child.type == "field_declaration":
-							identifier_node = None
-							type_node = None
-							for field_child in body_child.children:
-								if field_child.type in ["type_identifier", "generic_type"]:
-									type_node = field_child
-								elif field_child.type == "variable_declarator":
-									identifier_node = next((c for c in field_child.children if c.type == "identifier"), None)
-								
-							if identifier_node and type_node and identifier_node.text.decode() == variable_name:
-								field_type = self._get_type_name(type_node)
-								return field_type
+			return self._get_class_fields(class_node).get(variable_name)
 		
 		return None
 	
-	def _search_variable_declaration(self, block_node, variable_name):
-		for child in block_node.children:
-			if child.type == "local_variable_declaration":
-				type_node = None
-				identifier_node = None
-				for decl_child in child.children:
-					if decl_child.type in ["type_identifier", "generic_type"]:
-						type_node = decl_child
-					elif decl_child.type == "variable_declarator":
-						identifier_node = next((c for c in decl_child.children if c.type == "identifier"), None)
-				
-				if identifier_node and type_node and identifier_node.text.decode() == variable_name:
-					return self._get_type_name(type_node)
-			
-			elif child.type == "block":
-				result = self._search_variable_declaration(child, variable_name)
-				if result:
-					return result
+	def _get_method_variables(self, method_node):
+		"""Get the local variable types declared in a method's blocks, built once per method."""
+		variables = self._method_variables.get(method_node)
+		if variables is None:
+			variables = self._method_variables[method_node] = {}
+			for child in method_node.children:
+				if child.type == "block":
+					self._merge_block_variables(variables, self._collect_block_variables(child))
+		return variables
+	
+	def _collect_block_variables(self, block_node):
+		"""Map each variable name to the type of its first declaration in a block.
 		
-		return None
+		A declaration directly in the block takes effect even when its type name
+		cannot be read (mapped to None), while nested blocks only contribute
+		names they resolve to a type.
+		"""
+		# Stack of (remaining children, variables) for the blocks being collected
+		stack = [(iter(block_node.children), {})]
+		while True:
+			children, variables = stack[-1]
+			for child in children:
+				if child.type == "local_variable_declaration":
+					name, type_name = self._get_declared_variable(child)
+					if name is not None and name not in variables:
+						variables[name] = type_name
+				elif child.type == "block":
+					stack.append((iter(child.children), {}))
+					break
+			else:
+				stack.pop()
+				if not stack:
+					return variables
+				self._merge_block_variables(stack[-1][1], variables)
 	
-	def _find_containing_class_name(self, node):
-		current = node.parent
-		while current:
-			if current.type in ["class_declaration", "interface_declaration", "enum_declaration", "record_declaration"]:
-				name_node = next((c for c in current.children if c.type == "identifier"), None)
-				if name_node:
-					return name_node.text.decode()
-			current = current.parent
-		return None
+	def _merge_block_variables(self, variables, nested):
+		for name, type_name in nested.items():
+			if type_name and name not in variables:
+				variables[name] = type_name
 	
-	def _find_containing_method(self, node):
-		current = node.parent
-		while current:
-			if current.type == "method_declaration":
-				method_name = self._get_identifier_name(current)
-				class_name = self._find_containing_class_name(current)
-				if method_name and class_name:
-					return self._get_component_id(f"{class_name}.{method_name}")
-			current = current.parent
-		return None
+	def _get_class_fields(self, class_node):
+		"""Get the types of a class's fields by name, built once per class."""
+		fields = self._class_fields.get(class_node)
+		if fields is None:
+			fields = self._class_fields[class_node] = {}
+			body = class_node.child_by_field_name("body")
+			if body is not None:
+				for child in body.children:
+					if child.type == "field_declaration":
+						name, type_name = self._get_declared_variable(child)
+						if name is not None:
+							fields.setdefault(name, type_name)
+		return fields
 	
-	def _find_class_node_by_name(self, class_name):
-		"""Find the class node by its name in the AST."""
-		def search_in_node(node):
-			if node.type == "class_declaration":
-				name_node = next((c for c in node.children if c.type == "identifier"), None)
-				if name_node and name_node.text.decode() == class_name:
-					return node
-			for child in node.children:
-				result = search_in_node(child)
-				if result:
-					return result
-			return None
+	def _get_declared_variable(self, declaration_node):
+		"""Get the (name, type name) declared by a field or local variable declaration.
 		
-		root = self._get_root_node()
-		if root:
-			return search_in_node(root)
-		return None
+		Only class types are considered, and for a declaration with several
+		declarators the last one is used. Returns (None, None) otherwise.
+		"""
+		type_node = self._get_class_type_node(declaration_node)
+		declarators = declaration_node.children_by_field_name("declarator")
+		if type_node is None or not declarators:
+			return None, None
+		identifier_node = declarators[-1].child_by_field_name("name")
+		if identifier_node is None:
+			return None, None
+		return self._text(identifier_node), self._get_type_name(type_node)
+	
+	def _find_containing_class_name(self, node):
+		return self._enclosing[node][0]
+	
+	def _find_containing_method(self, node):
+		return self._enclosing[node][2]
+
+	def _get_class_mapping(self, class_node):
+		"""Get whether a class is a controller and its path prefix, computed once per class."""
+		mapping = self._class_mappings.get(class_node)
+		if mapping is None:
+			mapping = self._class_mappings[class_node] = (
+				self._is_controller_class(class_node),
+				self._extract_path_prefix_from_class_annotations(class_node),
+			)
+		return mapping
 
 	def _is_controller_class(self, class_node):
 		"""Check if a class node has Controller-related annotations."""
-		logger.debug(f"Checking if class has Controller annotation")
+		logger.debug("Checking if class has Controller annotation")
 		# Check for annotations in the class modifiers
-		for child in class_node.children:
-			if child.type == "modifiers":
-				for modifier_child in child.children:
-					if modifier_child.type == "annotation" or modifier_child.type == "marker_annotation":
-						annotation_node = modifier_child
-						if modifier_child.type == "marker_annotation":
-							# For marker annotations, look for the annotation inside
-							annotation_children = [c for c in modifier_child.children if c.type == "annotation"]
-							if annotation_children:
-								annotation_node = annotation_children[0]
-						annotation_name = None
-						for grandchild in annotation_node.children:
-							if grandchild.type == "identifier":
-								annotation_name = grandchild.text.decode()
-								break
-						if annotation_name:
-							trimmed_annotation = annotation_name.split('.')[-1]
-							logger.debug(f"Found class annotation: {trimmed_annotation}")
-							if trimmed_annotation in ["Controller", "RestController"]:
-								logger.debug(f"Class has Controller annotation: {trimmed_annotation}")
-								return True
+		modifiers = self._get_modifiers(class_node)
+		if modifiers is not None:
+			for modifier_child in modifiers.children:
+				if modifier_child.type == "annotation" or modifier_child.type == "marker_annotation":
+					annotation_name = self._get_name_bytes(modifier_child)
+					if annotation_name in _CONTROLLER_ANNOTATIONS:
+						logger.debug("Class has Controller annotation: %s", annotation_name.decode())
+						return True
 		return False
 
 	def _extract_path_prefix_from_class_annotations(self, class_node):
 		"""Extract path prefix from class level annotations like @RequestMapping("/api")."""
-		logger.debug(f"Checking class for path prefix annotations")
+		logger.debug("Checking class for path prefix annotations")
 		# Check for annotations in the class modifiers
-		for child in class_node.children:
-			if child.type == "modifiers":
-				for modifier_child in child.children:
-					if modifier_child.type == "annotation":
-						annotation_name = None
-						annotation_arg_list = None
-						
-						for grandchild in modifier_child.children:
-							if grandchild.type == "identifier":
-								annotation_name = grandchild.text.decode()
-							elif grandchild.type == "annotation_argument_list":
-								annotation_arg_list = grandchild
-						
-						if annotation_name:
-							trimmed_annotation = annotation_name.split('.')[-1]
-							logger.debug(f"Found class annotation: {trimmed_annotation}")
-							# Check if it's a request mapping annotation
-							if trimmed_annotation in ["RequestMapping", "GetMapping", "PostMapping", 
-													 "PutMapping", "DeleteMapping", "PatchMapping"]:
-								if annotation_arg_list:
-									# Look for 'value' or 'path' argument
-									for arg in annotation_arg_list.children:
-										if arg.type == "element_value_pair":
-											key_node = next((c for c in arg.children if c.type == "identifier"), None)
-											if key_node and key_node.text.decode() in ["value", "path"]:
-												value_node = next((c for c in arg.children 
-															  if c.type in ["string_literal", "element_value_array_initializer"]), None)
-												if value_node and value_node.type == "string_literal":
-													text = value_node.text.decode()
-													if text.startswith('"') and text.endswith('"'):
-														path_prefix = text[1:-1]
-														logger.debug(f"Found class path prefix: {path_prefix}")
-														return path_prefix
-										elif arg.type == "string_literal":
-											# Direct string argument (like @RequestMapping("/api"))
-											text = arg.text.decode()
-											if text.startswith('"') and text.endswith('"'):
-												path_prefix = text[1:-1]
-												logger.debug(f"Found class path prefix: {path_prefix}")
-												return path_prefix
+		modifiers = self._get_modifiers(class_node)
+		if modifiers is not None:
+			for modifier_child in modifiers.children:
+				if modifier_child.type == "annotation":
+					# Check if it's a request mapping annotation
+					if self._get_name_bytes(modifier_child) in _MAPPING_ANNOTATIONS:
+						annotation_arg_list = modifier_child.child_by_field_name("arguments")
+						if annotation_arg_list:
+							# Look for 'value' or 'path' argument
+							for arg in annotation_arg_list.children:
+								if arg.type == "element_value_pair":
+									key_node = arg.child_by_field_name("key")
+									if key_node and self._src[key_node.start_byte:key_node.end_byte] in _URL_ARGUMENT_KEYS:
+										value_node = arg.child_by_field_name("value")
+										if value_node and value_node.type == "string_literal":
+											path_prefix = self._string_value(value_node)
+											logger.debug("Found class path prefix: %s", path_prefix)
+											return path_prefix
+								elif arg.type == "string_literal":
+									# Direct string argument (like @RequestMapping("/api"))
+									path_prefix = self._string_value(arg)
+									logger.debug("Found class path prefix: %s", path_prefix)
+									return path_prefix
 		return None
 
-	def _get_root_node(self):
-		"""Return the stored root node."""
-		return getattr(self, 'root_node', None)
 
 def analyze_java_file(file_path: str, content: str, repo_path: str = None) -> Tuple[List[Node], List[CallRelationship]]:
+	# A full parse supersedes any tree kept for incremental re-parsing
+	_tree_cache.pop(os.path.abspath(file_path), None)
 	analyzer = TreeSitterJavaAnalyzer(file_path, content, repo_path)
 	return analyzer.nodes, analyzer.call_relationships
+
+
+def analyze_java_file_incremental(file_path: str, content: str, repo_path: str = None) -> Tuple[List[Node], List[CallRelationship]]:
+	"""Analyze a Java file, reusing the parse tree from its previous analysis.
+	
+	The edit applied to the kept tree is computed from the source it was
+	parsed from, so the result is the same as analyze_java_file's. The first
+	call for a file parses it from scratch.
+	"""
+	key = os.path.abspath(file_path)
+	src = content.encode("utf8")
+	old_tree = None
+	cached = _tree_cache.pop(key, None)
+	if cached is not None:
+		old_src, old_tree = cached
+		edit = _compute_edit(old_src, src)
+		if edit is not None:
+			old_tree.edit(**edit)
+	
+	analyzer = TreeSitterJavaAnalyzer(file_path, content, repo_path, old_tree=old_tree)
+	if analyzer.tree is not None:
+		_tree_cache[key] = (src, analyzer.tree)
+		if len(_tree_cache) > _MAX_CACHED_TREES:
+			_tree_cache.popitem(last=False)
+	return analyzer.nodes, analyzer.call_relationships
@@ -2,6 +2,7 @@ import logging
 import os
 import traceback
 from typing import List, Set, Optional, Tuple
+from operator import attrgetter
 from pathlib import Path
 import sys
 import os
@@ -117,7 +118,7 @@ class TreeSitterJSAnalyzer:
 
     def _extract_functions(self, node) -> None:
         self._traverse_for_functions(node)
-        self.nodes.sort(key=lambda n: n.start_line)
+        self.nodes.sort(key=attrgetter("start_line"))
 
     def _traverse_for_functions(self, node) -> None:
         if node.type in ["class_declaration", "abstract_class_declaration", "interface_declaration"]:
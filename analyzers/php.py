@@ -3,48 +3,58 @@ PHP AST analyzer for call graph generation using tree-sitter.
 """
 import logging
 import os
-import traceback
+import re
 from typing import List, Set, Optional, Tuple
+from operator import attrgetter
 from pathlib import Path
 import sys
 import os
 
-from tree_sitter import Parser
-from ..setup_parser import get_parser
+from ..setup_parser import get_cached_parser
 from ..models import Node, CallRelationship
 
 logger = logging.getLogger(__name__)
 
+# PHP magic methods and main, which are not reported as functions
+_EXCLUDED_FUNCTION_NAMES = frozenset({
+    "__construct", "__destruct", "__get", "__set", "__isset", "__unset",
+    "__call", "__callStatic", "__toString", "__invoke", "__set_state",
+    "__clone", "__debugInfo", "main",
+})
+
+# Nodes and calls only come from inside functions, methods and classes, so a
+# file without any of these keywords (PHP keywords are case-insensitive) is
+# not parsed at all
+_DECLARATION_KEYWORDS = re.compile(rb"function|class|interface", re.IGNORECASE)
+
 
 class TreeSitterPHPAnalyzer:
     def __init__(self, file_path: str, content: str, repo_path: str = None):
         self.file_path = Path(file_path)
         self.content = content
+        # Encoded once; node text and source snippets are slices of these bytes
+        self._content_bytes = content.encode("utf8")
         self.repo_path = repo_path or ""
+        # The paths depend only on file_path and repo_path, so compute them once
+        self._relative_path = self._compute_relative_path()
+        self._module_path = sys.intern(self._compute_module_path())
+        self._module_prefix = self._module_path + "."
         self.nodes: List[Node] = []
         self.call_relationships: List[CallRelationship] = []
         
         self.top_level_nodes = {}
         
         self.seen_relationships = set()
+        # Call relationships whose is_resolved waits for every declaration
+        self._pending_calls: List[CallRelationship] = []
 
         try:
-            php_language = get_parser("php")
-            if php_language is None:
+            self.parser = get_cached_parser("php")
+            if self.parser is None:
                 logger.warning("PHP parser not available")
-                self.parser = None
-            else:
-                self.parser = Parser()
-                try:
-                    # Try the newer API first (tree-sitter>=0.20.0)
-                    self.parser.set_language(php_language)
-                except AttributeError:
-                    # Fallback to older API if needed
-                    self.parser.language = php_language
 
         except Exception as e:
-            logger.error(f"Failed to initialize PHP parser: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.error(f"Failed to initialize PHP parser: {e}", exc_info=True)
             self.parser = None
 
 
@@ -62,14 +72,19 @@ class TreeSitterPHPAnalyzer:
             logger.warning(f"Skipping {self.file_path} - parser initialization failed")
             return
 
+        if _DECLARATION_KEYWORDS.search(self._content_bytes) is None:
+            logger.debug(f"Skipping {self.file_path} - no functions or classes")
+            return
+
         try:
-            tree = self.parser.parse(bytes(self.content, "utf8"))
+            tree = self.parser.parse(self._content_bytes)
             root_node = tree.root_node
 
             logger.debug(f"Parsed AST with root node type: {root_node.type}")
 
-            self._extract_functions(root_node)
-            self._extract_call_relationships(root_node)
+            self._walk(root_node)
+            self.nodes.sort(key=attrgetter("start_line"))
+            self._resolve_call_relationships()
 
             logger.debug(
                 f"Analysis complete: {len(self.nodes)} nodes, {len(self.call_relationships)} relationships"
@@ -78,154 +93,156 @@ class TreeSitterPHPAnalyzer:
         except Exception as e:
             logger.error(f"Error analyzing PHP file {self.file_path}: {e}", exc_info=True)
 
-    def _get_module_path(self) -> str:
+    def _compute_relative_path(self) -> str:
         if self.repo_path:
             try:
-                rel_path = os.path.relpath(str(self.file_path), self.repo_path)
+                return os.path.relpath(str(self.file_path), self.repo_path)
             except ValueError:
-                rel_path = str(self.file_path)
+                return str(self.file_path)
         else:
-            rel_path = str(self.file_path)
-        
+            return str(self.file_path)
+
+    def _compute_module_path(self) -> str:
+        rel_path = self._relative_path
         for ext in ['.php', '.phtml', '.inc']:
             if rel_path.endswith(ext):
                 rel_path = rel_path[:-len(ext)]
                 break
         return rel_path.replace('/', '.').replace('\\', '.')
 
+    def _get_module_path(self) -> str:
+        return self._module_path
+
     def _get_relative_path(self) -> str:
-        if self.repo_path:
-            try:
-                return os.path.relpath(str(self.file_path), self.repo_path)
-            except ValueError:
-                return str(self.file_path)
-        else:
-            return str(self.file_path)
+        return self._relative_path
 
     def _get_component_id(self, name: str, class_name: str = None, is_method: bool = False) -> str:
-        module_path = self._get_module_path()
-        
+        # IDs are interned so the many nodes and relationships naming the same
+        # component share one string and compare by identity in sets and dicts
         if is_method and class_name:
-            return f"{module_path}.{class_name}.{name}"
-        elif class_name and not is_method: 
-            return f"{module_path}.{name}"
-        else:  
-            return f"{module_path}.{name}"
-
-    def _extract_functions(self, node) -> None:
-        self._traverse_for_functions(node)
-        self.nodes.sort(key=lambda n: n.start_line)
-
-    def _traverse_for_functions(self, node) -> None:
-        if node.type in ["class_declaration"]:
-            cls = self._extract_class_declaration(node)
-            if cls:
-                self.nodes.append(cls)
-                self.top_level_nodes[cls.name] = cls
-                
-                self._extract_methods_from_class(node, cls.name)
-        
-        elif node.type == "interface_declaration":
-            interface = self._extract_interface_declaration(node)
-            if interface:
-                self.nodes.append(interface)
-                self.top_level_nodes[interface.name] = interface
-                
-                self._extract_methods_from_interface(node, interface.name)
-        
-        elif node.type in ["function_definition", "method_declaration", "class_declaration"]:
-            if node.type in ["function_definition", "method_declaration"]:
-                containing_class = self._find_containing_class(node)
-                if containing_class is None:
-                    func = self._extract_function_definition(node)
-                    if func and self._should_include_function(func):
-                        self.nodes.append(func)
-                        self.top_level_nodes[func.name] = func
-                else:
-                    # Handle methods inside classes
-                    method = self._extract_method_declaration(node, containing_class)
-                    if method and self._should_include_function(method):
-                        self.nodes.append(method)
-                        method_key = f"{self._get_component_id(method.name, containing_class, is_method=True)}"
-                        self.top_level_nodes[method_key] = method
-        
-        for child in node.children:
-            self._traverse_for_functions(child)
-
-    def _extract_methods_from_class(self, class_node, class_name: str) -> None:
-        class_body = self._find_child_by_type(class_node, "class_declaration")
-        if not class_body:
-            # Try to find class body differently
-            for child in class_node.children:
-                if child.type == "declaration_list":
-                    class_body = child
-                    break
-                elif child.type == "compound_statement":  # For class definitions without explicit declaration_list
-                    class_body = child
-                    break
-        
-        if not class_body:
-            return
-            
-        for child in class_body.children:
-            if child.type == "method_declaration":
-                method_name = self._get_method_name(child)
-                if method_name:
-                    method_key = f"{self._get_component_id(method_name, class_name, is_method=True)}"
-                    method_node = self._create_method_node(child, method_name, class_name)
-                    if method_node:
-                        self.top_level_nodes[method_key] = method_node
-
-    def _extract_methods_from_interface(self, interface_node, interface_name: str) -> None:
-        interface_body = self._find_child_by_type(interface_node, "declaration_list")
-        if not interface_body:
-            return
-            
-        for child in interface_body.children:
-            if child.type == "method_declaration":
-                method_name = self._get_method_name(child)
-                if method_name:
-                    method_key = f"{self._get_component_id(method_name, interface_name, is_method=True)}"
-                    method_node = self._create_method_node(child, method_name, interface_name)
-                    if method_node:
-                        self.top_level_nodes[method_key] = method_node
-
-    def _get_method_name(self, method_node) -> Optional[str]:
-        """Get method name from method_declaration node."""
-        for child in method_node.children:
-            if child.type == "name":
-                return self._get_node_text(child)
-        return None
+            return sys.intern(f"{self._module_prefix}{class_name}.{name}")
+        return sys.intern(self._module_prefix + name)
+
+    def _walk(self, root_node) -> None:
+        """Extract declarations and calls in a single pre-order walk of the tree.
+
+        A TreeCursor is moved through the tree while a stack holds the context
+        of each node on the current path: the name of the enclosing class, used
+        for method component IDs, and the name of the enclosing class or
+        function, used as the caller of calls. Handled node types are
+        dispatched through _NODE_HANDLERS, which return the context for the
+        node's children.
+        """
+        handlers = self._NODE_HANDLERS
+        cursor = root_node.walk()
+        # (containing class, current top level) inherited by the current node
+        contexts = [(None, None)]
+        while True:
+            node = cursor.node
+            containing_class, current_top_level = contexts[-1]
+            handler = handlers.get(node.type)
+            if handler is not None:
+                containing_class, current_top_level = handler(
+                    self, node, containing_class, current_top_level
+                )
+
+            if cursor.goto_first_child():
+                contexts.append((containing_class, current_top_level))
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return
+                contexts.pop()
+
+    def _visit_class(self, node, containing_class, current_top_level):
+        cls = self._extract_class_declaration(node)
+        if cls:
+            self.nodes.append(cls)
+            self.top_level_nodes[cls.name] = cls
+
+        name_node = self._find_child_by_type(node, "name")
+        if name_node:
+            containing_class = current_top_level = self._get_node_text(name_node)
+            self._extract_inheritance_relationships(node, current_top_level)
+        return containing_class, current_top_level
+
+    def _visit_interface(self, node, containing_class, current_top_level):
+        interface = self._extract_interface_declaration(node)
+        if interface:
+            self.nodes.append(interface)
+            self.top_level_nodes[interface.name] = interface
+        return containing_class, current_top_level
+
+    def _visit_function(self, node, containing_class, current_top_level):
+        name_node = self._find_child_by_type(node, "name")
+        if not name_node:
+            return containing_class, current_top_level
+
+        name = self._get_node_text(name_node)
+        # Excluded names are checked before any Node is built for them
+        if name in _EXCLUDED_FUNCTION_NAMES:
+            logger.debug(f"Skipping excluded function: {name}")
+        elif containing_class is None:
+            func = self._extract_function_definition(node)
+            if func:
+                self.nodes.append(func)
+                self.top_level_nodes[func.name] = func
+        else:
+            # Handle methods inside classes
+            method = self._extract_method_declaration(node, containing_class)
+            if method:
+                self.nodes.append(method)
+                # Keyed by the method's component ID, which is already built
+                self.top_level_nodes[method.id] = method
 
-    def _create_method_node(self, node, method_name: str, class_name: str) -> Optional[Node]:
-        """Create a method node for relationship mapping."""
-        try:
-            line_start = node.start_point[0] + 1
-            line_end = node.end_point[0] + 1
-            component_id = self._get_component_id(method_name, class_name, is_method=True)
-            relative_path = self._get_relative_path()
-            
-            return Node(
-                id=component_id,
-                name=method_name,
-                component_type="method",
-                file_path=str(self.file_path),
-                relative_path=relative_path,
-                source_code="\n".join(self.content.splitlines()[line_start - 1 : line_end]),
-                start_line=line_start,
-                end_line=line_end,
-                has_docstring=False,
-                docstring="",
-                parameters=None,
-                node_type="method",
-                base_classes=None,
-                class_name=class_name,
-                display_name=f"method {method_name}",
-                component_id=component_id
-            )
-        except Exception as e:
-            logger.debug(f"Error creating method node for {method_name}: {e}")
-            return None
+        return containing_class, name
+
+    def _visit_function_call(self, node, containing_class, current_top_level):
+        if current_top_level:
+            call_info = self._extract_call_from_node(node, current_top_level)
+            if call_info and self._add_relationship(call_info):
+                self._pending_calls.append(call_info)
+        return containing_class, current_top_level
+
+    def _visit_member_call(self, node, containing_class, current_top_level):
+        if current_top_level:
+            call_info = self._extract_member_call_from_node(node, current_top_level)
+            if call_info and self._add_relationship(call_info):
+                self._pending_calls.append(call_info)
+        return containing_class, current_top_level
+
+    # Node type -> handler returning the (containing class, current top level)
+    # context of the node's children
+    _NODE_HANDLERS = {
+        "class_declaration": _visit_class,
+        "interface_declaration": _visit_interface,
+        "function_definition": _visit_function,
+        "method_declaration": _visit_function,
+        "function_call_expression": _visit_function_call,
+        "member_call_expression": _visit_member_call,
+    }
+
+    def _extract_inheritance_relationships(self, node, class_name: str) -> None:
+        for child in node.children:
+            if child.type == "extends_clause":
+                for ext in child.children:
+                    if ext.type == "name":
+                        base_class = self._get_node_text(ext)
+                        caller_id = self._get_component_id(class_name)
+                        callee_id = self._get_component_id(base_class)
+                        inheritance_rel = CallRelationship(
+                            caller=caller_id,
+                            callee=callee_id,
+                            call_line=node.start_point[0] + 1,
+                            is_resolved=False
+                        )
+                        self._add_relationship(inheritance_rel)
+
+    def _resolve_call_relationships(self) -> None:
+        """Mark calls to functions and classes declared anywhere in the file as resolved."""
+        prefix_len = len(self._module_prefix)
+        for relationship in self._pending_calls:
+            relationship.is_resolved = relationship.callee[prefix_len:] in self.top_level_nodes
 
     def _extract_class_declaration(self, node) -> Optional[Node]:
         """Extract class declaration."""
@@ -250,18 +267,15 @@ class TreeSitterPHPAnalyzer:
                         if impl.type == "name":
                             base_classes.append(self._get_node_text(impl))
             
-            code_snippet = "\n".join(self.content.splitlines()[line_start - 1 : line_end])
-            
             component_id = self._get_component_id(name, is_method=False)
             relative_path = self._get_relative_path()
             
-            return Node(
+            component = Node(
                 id=component_id,
                 name=name,
                 component_type="class",
                 file_path=str(self.file_path),
                 relative_path=relative_path,
-                source_code=code_snippet,
                 start_line=line_start,
                 end_line=line_end,
                 has_docstring=bool(docstring),
@@ -273,6 +287,8 @@ class TreeSitterPHPAnalyzer:
                 display_name=f"class {name}",
                 component_id=component_id,
             )
+            component.set_source_span(self._content_bytes, node.start_byte, node.end_byte)
+            return component
         except Exception:
             return None
 
@@ -295,18 +311,15 @@ class TreeSitterPHPAnalyzer:
                         if ext.type == "name":
                             base_classes.append(self._get_node_text(ext))
             
-            code_snippet = "\n".join(self.content.splitlines()[line_start - 1 : line_end])
-            
             component_id = self._get_component_id(name, is_method=False)
             relative_path = self._get_relative_path()
             
-            return Node(
+            component = Node(
                 id=component_id,
                 name=name,
                 component_type="interface",
                 file_path=str(self.file_path),
                 relative_path=relative_path,
-                source_code=code_snippet,
                 start_line=line_start,
                 end_line=line_end,
                 has_docstring=bool(docstring),
@@ -318,6 +331,8 @@ class TreeSitterPHPAnalyzer:
                 display_name=f"interface {name}",
                 component_id=component_id,
             )
+            component.set_source_span(self._content_bytes, node.start_byte, node.end_byte)
+            return component
         except Exception:
             return None
 
@@ -331,7 +346,6 @@ class TreeSitterPHPAnalyzer:
             line_start = node.start_point[0] + 1
             line_end = node.end_point[0] + 1
             parameters = self._extract_parameters(node)
-            code_snippet = self._get_node_text(node)
 
             display_name = f"function {func_name}"
             node_type = "function"
@@ -339,13 +353,12 @@ class TreeSitterPHPAnalyzer:
             component_id = self._get_component_id(func_name, is_method=False)
             relative_path = self._get_relative_path()
 
-            return Node(
+            component = Node(
                 id=component_id,
                 name=func_name,
                 component_type=node_type,
                 file_path=str(self.file_path),
                 relative_path=relative_path,
-                source_code=code_snippet,
                 start_line=line_start,
                 end_line=line_end,
                 has_docstring=False,
@@ -357,6 +370,8 @@ class TreeSitterPHPAnalyzer:
                 display_name=display_name,
                 component_id=component_id,
             )
+            component.set_source_span(self._content_bytes, node.start_byte, node.end_byte)
+            return component
         except Exception as e:
             logger.debug(f"Error extracting function definition: {e}")
             return None
@@ -371,7 +386,6 @@ class TreeSitterPHPAnalyzer:
             line_start = node.start_point[0] + 1
             line_end = node.end_point[0] + 1
             parameters = self._extract_parameters(node)
-            code_snippet = self._get_node_text(node)
 
             display_name = f"method {method_name}"
             node_type = "method"
@@ -379,13 +393,12 @@ class TreeSitterPHPAnalyzer:
             component_id = self._get_component_id(method_name, class_name, is_method=True)
             relative_path = self._get_relative_path()
 
-            return Node(
+            component = Node(
                 id=component_id,
                 name=method_name,
                 component_type=node_type,
                 file_path=str(self.file_path),
                 relative_path=relative_path,
-                source_code=code_snippet,
                 start_line=line_start,
                 end_line=line_end,
                 has_docstring=False,
@@ -397,21 +410,12 @@ class TreeSitterPHPAnalyzer:
                 display_name=display_name,
                 component_id=component_id,
             )
+            component.set_source_span(self._content_bytes, node.start_byte, node.end_byte)
+            return component
         except Exception as e:
             logger.debug(f"Error extracting method declaration: {e}")
             return None
 
-    def _should_include_function(self, func: Node) -> bool:
-        excluded_names = {"__construct", "__destruct", "__get", "__set", "__isset", "__unset", 
-                         "__call", "__callStatic", "__toString", "__invoke", "__set_state", 
-                         "__clone", "__debugInfo", "main"}  # PHP magic methods and main
-
-        if func.name in excluded_names:
-            logger.debug(f"Skipping excluded function: {func.name}")
-            return False
-
-        return True
-
     def _extract_parameters(self, node) -> List[str]:
         parameters = []
         params_node = self._find_child_by_type(node, "formal_parameters")
@@ -428,52 +432,6 @@ class TreeSitterPHPAnalyzer:
                             parameters.append(param_name)
         return parameters
 
-    def _extract_call_relationships(self, node) -> None:
-        current_top_level = None
-        self._traverse_for_calls(node, current_top_level)
-
-    def _traverse_for_calls(self, node, current_top_level) -> None:
-        if node.type in ["class_declaration"]:
-            name_node = self._find_child_by_type(node, "name")
-            if name_node:
-                current_top_level = self._get_node_text(name_node)
-                
-                # Handle inheritance relationships
-                for child in node.children:
-                    if child.type == "extends_clause":
-                        for ext in child.children:
-                            if ext.type == "name":
-                                base_class = self._get_node_text(ext)
-                                caller_id = self._get_component_id(current_top_level)
-                                callee_id = f"{self._get_module_path()}.{base_class}" 
-                                inheritance_rel = CallRelationship(
-                                    caller=caller_id,
-                                    callee=callee_id,
-                                    call_line=node.start_point[0] + 1,
-                                    is_resolved=False
-                                )
-                                self._add_relationship(inheritance_rel)
-        
-        elif node.type in ["function_definition", "method_declaration"]:
-            name_node = self._find_child_by_type(node, "name")
-            if name_node:
-                current_top_level = self._get_node_text(name_node)
-
-        # Look for function/method calls
-        if node.type == "function_call_expression" and current_top_level:
-            call_info = self._extract_call_from_node(node, current_top_level)
-            if call_info:
-                self._add_relationship(call_info)
-        
-        # Look for method calls on objects
-        elif node.type == "member_call_expression" and current_top_level:
-            call_info = self._extract_member_call_from_node(node, current_top_level)
-            if call_info:
-                self._add_relationship(call_info)
-
-        for child in node.children:
-            self._traverse_for_calls(child, current_top_level)
-
     def _extract_call_from_node(self, node, caller_name: str) -> Optional[CallRelationship]:
         """Extract call relationship from a function_call_expression node."""
         try:
@@ -486,17 +444,16 @@ class TreeSitterPHPAnalyzer:
             # Remove namespace prefixes for comparison
             callee_name_clean = callee_name.split('\\')[-1]  # Get the actual function name
             
-            caller_id = f"{self._get_module_path()}.{caller_name}"
-            callee_id = f"{self._get_module_path()}.{callee_name_clean}"
-            
-            # Check if the callee is a known function in our analysis
-            is_resolved = callee_name_clean in self.top_level_nodes
+            caller_id = self._get_component_id(caller_name)
+            callee_id = self._get_component_id(callee_name_clean)
             
+            # Whether the callee is a known function is settled once the
+            # whole file has been walked
             return CallRelationship(
                 caller=caller_id,
                 callee=callee_id,
                 call_line=call_line,
-                is_resolved=is_resolved,
+                is_resolved=False,
             )
             
         except Exception as e:
@@ -512,17 +469,16 @@ class TreeSitterPHPAnalyzer:
             if not callee_name:
                 return None
             
-            caller_id = f"{self._get_module_path()}.{caller_name}"
-            callee_id = f"{self._get_module_path()}.{callee_name}"
-            
-            # Check if the callee is a known function in our analysis
-            is_resolved = callee_name in self.top_level_nodes
+            caller_id = self._get_component_id(caller_name)
+            callee_id = self._get_component_id(callee_name)
             
+            # Whether the callee is a known function is settled once the
+            # whole file has been walked
             return CallRelationship(
                 caller=caller_id,
                 callee=callee_id,
                 call_line=call_line,
-                is_resolved=is_resolved,
+                is_resolved=False,
             )
             
         except Exception as e:
@@ -578,20 +534,7 @@ class TreeSitterPHPAnalyzer:
         return None
 
     def _get_node_text(self, node) -> str:
-        start_byte = node.start_byte
-        end_byte = node.end_byte
-        return self.content.encode("utf8")[start_byte:end_byte].decode("utf8")
-
-    def _find_containing_class(self, method_node) -> Optional[str]:
-        """Find the containing class for a method."""
-        current = method_node.parent
-        while current:
-            if current.type == "class_declaration":
-                name_node = self._find_child_by_type(current, "name")
-                if name_node:
-                    return self._get_node_text(name_node)
-            current = current.parent
-        return None
+        return self._content_bytes[node.start_byte:node.end_byte].decode("utf8")
 
 
 def analyze_php_file(
@@ -608,4 +551,4 @@ def analyze_php_file(
         return analyzer.nodes, analyzer.call_relationships
     except Exception as e:
         logger.error(f"Error in tree-sitter PHP analysis for {file_path}: {e}", exc_info=True)
-        return [], []
\ No newline at end of file
+        return [], []
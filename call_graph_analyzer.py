@@ -6,23 +6,125 @@ Coordinates language-specific analyzers to build comprehensive call graphs
 across different programming languages in a repository.
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import functools
+import importlib
 import logging
 import traceback
 from pathlib import Path
 
 from .models import Node, CallRelationship
+from .utils.cache import AnalysisCache, FileStamp, file_digest, file_stamp
+from .utils.parallel import map_in_processes
 from .utils.patterns import CODE_EXTENSIONS
 from .utils.security import safe_open_text
 
 logger = logging.getLogger(__name__)
 
+# Language -> (analyzer module, entry point) used by analyze_code_file.
+# Analyzer modules are imported on first use.
+_LANGUAGE_ANALYZERS = {
+    "python": (".analyzers.python", "analyze_python_file"),
+    "javascript": (".analyzers.javascript", "analyze_javascript_file_treesitter"),
+    "typescript": (".analyzers.typescript", "analyze_typescript_file_treesitter"),
+    # Java trees are kept per process and reused when a file is analyzed again
+    "java": (".analyzers.java", "analyze_java_file_incremental"),
+    "csharp": (".analyzers.csharp", "analyze_csharp_file"),
+    "c": (".analyzers.c", "analyze_c_file"),
+    "cpp": (".analyzers.cpp", "analyze_cpp_file"),
+    "php": (".analyzers.php", "analyze_php_file"),
+}
+
+
+def analyze_code_file(
+    repo_dir: str, file_info: Dict
+) -> Tuple[List[Node], List[CallRelationship]]:
+    """
+    Analyze a single code file based on its language.
+
+    Routes to the appropriate language-specific analyzer. This is a module-level
+    function so that it can be run in worker processes.
+
+    Args:
+        repo_dir: Repository directory path
+        file_info: File information dictionary
+
+    Returns:
+        Tuple of (functions, relationships) found in the file
+    """
+    return analyze_code_content(repo_dir, file_info, read_code_file(repo_dir, file_info))
+
+
+def read_code_file(repo_dir: str, file_info: Dict) -> Optional[str]:
+    """
+    Read the content of a code file inside the repository.
+
+    Args:
+        repo_dir: Repository directory path
+        file_info: File information dictionary
+
+    Returns:
+        The file content, or None if it could not be read
+    """
+    file_path = Path(repo_dir) / file_info["path"]
+    try:
+        return safe_open_text(repo_dir, file_path)
+    except Exception as e:
+        logger.error(f"⚠️ Error analyzing {file_path}: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return None
+
+
+def analyze_code_content(
+    repo_dir: str, file_info: Dict, content: Optional[str]
+) -> Tuple[List[Node], List[CallRelationship]]:
+    """
+    Analyze the already-read content of a code file based on its language.
+
+    Args:
+        repo_dir: Repository directory path
+        file_info: File information dictionary
+        content: File content from read_code_file, or None if it was unreadable
+
+    Returns:
+        Tuple of (functions, relationships) found in the file
+    """
+    if content is None:
+        return [], []
+
+    file_path = Path(repo_dir) / file_info["path"]
+    try:
+        entry_point = _LANGUAGE_ANALYZERS.get(file_info["language"])
+        if entry_point is None:
+            return [], []
+
+        module_name, function_name = entry_point
+        module = importlib.import_module(module_name, __package__)
+        analyze_file = getattr(module, function_name)
+        return analyze_file(file_path, content, repo_path=repo_dir)
+
+    except Exception as e:
+        logger.error(f"⚠️ Error analyzing {file_path}: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return [], []
+
 
 class CallGraphAnalyzer:
-    def __init__(self):
-        """Initialize the call graph analyzer."""
+    def __init__(self, max_workers: Optional[int] = 1, cache_dir: Optional[str] = None):
+        """
+        Initialize the call graph analyzer.
+
+        Args:
+            max_workers: Number of worker processes used to analyze files;
+                1 (the default) analyzes them in this process, None uses every CPU
+            cache_dir: Directory of the persistent per-file result cache,
+                or None to analyze every file from scratch
+        """
         self.functions: Dict[str, Node] = {}
         self.call_relationships: List[CallRelationship] = []
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
         logger.debug("CallGraphAnalyzer initialized.")
 
     def analyze_code_files(self, code_files: List[Dict], base_dir: str) -> Dict:
@@ -30,20 +132,63 @@ class CallGraphAnalyzer:
         Complete analysis: Analyze all files to build complete call graph with all nodes.
 
         This approach:
-        1. Analyzes all code files 
+        1. Analyzes all code files, in worker processes if configured, reusing
+           cached results for unchanged files when a cache is configured
         2. Extracts all functions and relationships
         3. Builds complete call graph
         4. Returns all nodes and relationships 
         """
         logger.debug(f"Starting analysis of {len(code_files)} files")
+        file_results = self._analyze_files(code_files, base_dir)
+        return self._build_call_graph(code_files, base_dir, file_results)
+
+    async def analyze_code_files_async(
+        self, code_files: List[Dict], base_dir: str, batch_size: int = 64
+    ) -> Dict:
+        """
+        Async variant of analyze_code_files that analyzes files on worker threads.
+
+        Files are processed in batches: each batch is read concurrently and then
+        parsed concurrently with asyncio.to_thread, which hides disk latency on
+        cold caches and network filesystems. Results are identical to
+        analyze_code_files.
 
+        Args:
+            code_files: File information dictionaries
+            base_dir: Repository directory path
+            batch_size: Number of files read and parsed concurrently
+
+        Returns:
+            Dict: Same structure as analyze_code_files
+        """
+        logger.debug(f"Starting async analysis of {len(code_files)} files")
+        file_results = await self._analyze_files_async(code_files, base_dir, batch_size)
+        return self._build_call_graph(code_files, base_dir, file_results)
+
+    def _build_call_graph(
+        self,
+        code_files: List[Dict],
+        base_dir: str,
+        file_results: List[Tuple[List[Node], List[CallRelationship]]],
+    ) -> Dict:
+        """
+        Merge per-file results and resolve them into the complete call graph.
+
+        Args:
+            code_files: File information dictionaries
+            base_dir: Repository directory path
+            file_results: (functions, relationships) for each file in code_files
+
+        Returns:
+            Dict with the call graph summary, functions, relationships and visualization
+        """
         self.functions = {}
         self.call_relationships = []
 
         files_analyzed = 0
-        for file_info in code_files:
-            logger.debug(f"Analyzing: {file_info['path']}")
-            self._analyze_code_file(base_dir, file_info)
+        for file_info, (functions, relationships) in zip(code_files, file_results):
+            logger.debug(f"Analyzed: {file_info['path']}")
+            self._add_file_results(Path(base_dir) / file_info["path"], functions, relationships)
             files_analyzed += 1
         logger.debug(
             f"Analysis complete: {files_analyzed} files analyzed, {len(self.functions)} functions, {len(self.call_relationships)} relationships"
@@ -67,260 +212,206 @@ class CallGraphAnalyzer:
             "visualization": viz_data,
         }
 
-    def extract_code_files(self, file_tree: Dict) -> List[Dict]:
+    def _analyze_files(
+        self, code_files: List[Dict], base_dir: str
+    ) -> List[Tuple[List[Node], List[CallRelationship]]]:
         """
-        Extract code files from file tree structure.
-
-        Filters files based on supported extensions and excludes test/config files.
+        Analyze code files, only parsing the ones missing from the cache.
 
         Args:
-            file_tree: Nested dictionary representing file structure
+            code_files: File information dictionaries
+            base_dir: Repository directory path
 
         Returns:
-            List of code file information dictionaries
-        """
-        code_files = []
-
-        def traverse(tree):
-            if tree["type"] == "file":
-                ext = tree.get("extension", "").lower()
-                if ext in CODE_EXTENSIONS:
-                    name = tree["name"].lower()
-                    if not any(skip in name for skip in []):
-                        code_files.append(
-                            {
-                                "path": tree["path"],
-                                "name": tree["name"],
-                                "extension": ext,
-                                "language": CODE_EXTENSIONS[ext],
-                            }
-                        )
-            elif tree["type"] == "directory" and tree.get("children"):
-                for child in tree["children"]:
-                    traverse(child)
-
-        traverse(file_tree)
-        return code_files
-
-    def _analyze_code_file(self, repo_dir: str, file_info: Dict):
+            List of (functions, relationships) in the same order as code_files
         """
-        Analyze a single code file based on its language.
-
-        Routes to appropriate language-specific analyzer.
-
-        Args:
-            repo_dir: Repository directory path
-            file_info: File information dictionary
-        """
-
-        base = Path(repo_dir)
-        file_path = base / file_info["path"]
+        analyze_file = functools.partial(analyze_code_file, base_dir)
+        if self.cache_dir is None:
+            return map_in_processes(analyze_file, code_files, max_workers=self.max_workers)
 
+        cache = AnalysisCache(self.cache_dir)
         try:
-            content = safe_open_text(base, file_path)
-            language = file_info["language"]
-            if language == "python":
-                self._analyze_python_file(file_path, content, repo_dir)
-            elif language == "javascript":
-                self._analyze_javascript_file(file_path, content, repo_dir)
-            elif language == "typescript":
-                self._analyze_typescript_file(file_path, content, repo_dir)
-            elif language == "java":
-                self._analyze_java_file(file_path, content, repo_dir)
-            elif language == "csharp":
-                self._analyze_csharp_file(file_path, content, repo_dir)
-            elif language == "c":
-                self._analyze_c_file(file_path, content, repo_dir)
-            elif language == "cpp":
-                self._analyze_cpp_file(file_path, content, repo_dir)
-            elif language == "php":
-                self._analyze_php_file(file_path, content, repo_dir)
-            # else:
-            #     logger.warning(
-            #         f"Unsupported language for call graph analysis: {language} for file {path}"
-            #     )
-
-        except Exception as e:
-            logger.error(f"⚠️ Error analyzing {file_path}: {str(e)}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-
-    def _analyze_python_file(self, file_path: str, content: str, base_dir: str):
+            file_results, misses = self._lookup_cached_results(cache, code_files, base_dir)
+            analyzed = map_in_processes(
+                analyze_file,
+                [code_files[index] for index, _, _, _ in misses],
+                max_workers=self.max_workers,
+            )
+            self._store_cached_results(cache, base_dir, file_results, misses, analyzed)
+            return file_results
+        finally:
+            cache.close()
+
+    async def _analyze_files_async(
+        self, code_files: List[Dict], base_dir: str, batch_size: int
+    ) -> List[Tuple[List[Node], List[CallRelationship]]]:
         """
-        Analyze Python file using Python AST analyzer.
+        Analyze code files on worker threads, only parsing the ones missing from the cache.
 
         Args:
-            file_path: Relative path to the Python file
-            content: File content string
-            base_dir: Repository base directory path
+            code_files: File information dictionaries
+            base_dir: Repository directory path
+            batch_size: Number of files read and parsed concurrently
+
+        Returns:
+            List of (functions, relationships) in the same order as code_files
         """
-        from .analyzers.python import analyze_python_file
+        if self.cache_dir is None:
+            return await self._analyze_batches_async(code_files, base_dir, batch_size)
 
+        cache = AnalysisCache(self.cache_dir)
         try:
-            functions, relationships = analyze_python_file(
-                file_path, content, repo_path=base_dir
+            file_results, misses = self._lookup_cached_results(cache, code_files, base_dir)
+            analyzed = await self._analyze_batches_async(
+                [code_files[index] for index, _, _, _ in misses], base_dir, batch_size
             )
+            self._store_cached_results(cache, base_dir, file_results, misses, analyzed)
+            return file_results
+        finally:
+            cache.close()
+
+    @staticmethod
+    async def _analyze_batches_async(
+        code_files: List[Dict], base_dir: str, batch_size: int
+    ) -> List[Tuple[List[Node], List[CallRelationship]]]:
+        """Read and then parse code files in concurrent batches on worker threads."""
+        file_results = []
+        for start in range(0, len(code_files), max(1, batch_size)):
+            batch = code_files[start : start + batch_size]
+            contents = await asyncio.gather(
+                *(asyncio.to_thread(read_code_file, base_dir, file_info) for file_info in batch)
+            )
+            file_results.extend(
+                await asyncio.gather(
+                    *(
+                        asyncio.to_thread(analyze_code_content, base_dir, file_info, content)
+                        for file_info, content in zip(batch, contents)
+                    )
+                )
+            )
+        return file_results
 
-            for func in functions:
-                func_id = func.id if func.id else f"{file_path}:{func.name}"
-                self.functions[func_id] = func
+    @staticmethod
+    def _lookup_cached_results(
+        cache: AnalysisCache, code_files: List[Dict], base_dir: str
+    ) -> Tuple[List, List[Tuple[int, str, Optional[FileStamp], Optional[bytes]]]]:
+        """
+        Fill in cached results and collect the files that still need analysis.
 
-            self.call_relationships.extend(relationships)
-        except Exception as e:
-            logger.error(f"Failed to analyze Python file {file_path}: {e}", exc_info=True)
+        Files are matched by their stamp first. A file whose stamp changed is
+        then matched by a digest of its content, so a checkout or touch that
+        leaves the content unchanged does not force a re-parse.
 
-    def _analyze_javascript_file(self, file_path: str, content: str, repo_dir: str):
+        Returns:
+            Tuple of (results with None for misses,
+            misses as (index, file_path, stamp, digest))
         """
-        Analyze JavaScript file using tree-sitter based AST analyzer
+        file_results = [None] * len(code_files)
+        misses = []
+        for index, file_info in enumerate(code_files):
+            file_path = str(Path(base_dir) / file_info["path"])
+            stamp = file_stamp(file_path)
+            cached = cache.get(base_dir, file_path, stamp)
+            if cached is not None:
+                file_results[index] = cached
+                continue
+
+            digest = file_digest(file_path) if stamp is not None else None
+            cached = cache.get_by_content(base_dir, file_path, digest) if digest is not None else None
+            if cached is None:
+                misses.append((index, file_path, stamp, digest))
+            else:
+                file_results[index] = cached
+                # Refresh the stamp so the next run hits without hashing
+                cache.put(base_dir, file_path, stamp, cached)
+        logger.debug(f"Result cache: {len(code_files) - len(misses)} hits, {len(misses)} misses")
+        return file_results, misses
+
+    @staticmethod
+    def _store_cached_results(
+        cache: AnalysisCache,
+        base_dir: str,
+        file_results: List,
+        misses: List[Tuple[int, str, Optional[FileStamp], Optional[bytes]]],
+        analyzed: List[Tuple[List[Node], List[CallRelationship]]],
+    ) -> None:
+        """Place freshly analyzed results in file_results and store them in the cache."""
+        for (index, file_path, stamp, digest), result in zip(misses, analyzed):
+            file_results[index] = result
+            # Empty results are cached too, so files without components are
+            # not parsed again; a failure caused by an analyzer bug is retried
+            # once the fixed analyzer changes the cache's fingerprint.
+            cache.put(base_dir, file_path, stamp, result)
+            if digest is not None:
+                cache.put_by_content(base_dir, file_path, digest, result)
 
-        Args:
-            file_path: Relative path to the JavaScript file
-            content: File content string
-            repo_dir: Repository base directory
+    def extract_code_files(self, file_tree: Dict) -> List[Dict]:
         """
-        try:
-            from .analyzers.javascript import analyze_javascript_file_treesitter
-
-            functions, relationships = analyze_javascript_file_treesitter(
-                file_path, content, repo_path=repo_dir
-            )
-
-            for func in functions:
-                func_id = func.id if func.id else f"{file_path}:{func.name}"
-                self.functions[func_id] = func
-
-            self.call_relationships.extend(relationships)
-
-        except Exception as e:
-            logger.error(f"Failed to analyze JavaScript file {file_path}: {e}", exc_info=True)
+        Extract code files from file tree structure.
 
-    def _analyze_typescript_file(self, file_path: str, content: str, repo_dir: str):
-        """
-        Analyze TypeScript file using tree-sitter based AST analyzer 
+        Filters files based on supported extensions and excludes test/config files.
 
         Args:
-            file_path: Relative path to the TypeScript file
-            content: File content string
-        """
-        try:
-            from .analyzers.typescript import analyze_typescript_file_treesitter
-
-            functions, relationships = analyze_typescript_file_treesitter(
-                file_path, content, repo_path=repo_dir
-            )
+            file_tree: Nested dictionary representing file structure
 
-            for func in functions:
-                func_id = func.id if func.id else f"{file_path}:{func.name}"
-                self.functions[func_id] = func
+        Returns:
+            List of code file information dictionaries, in file tree order
+        """
+        code_files = []
 
-            self.call_relationships.extend(relationships)
+        def traverse(tree):
+            if tree["type"] == "file":
+                ext = tree.get("extension", "").lower()
+                language = CODE_EXTENSIONS.get(ext)
+                if language is not None:
+                    code_files.append(
+                        {
+                            "path": tree["path"],
+                            "name": tree["name"],
+                            "extension": ext,
+                            "language": language,
+                        }
+                    )
+            elif tree["type"] == "directory" and tree.get("children"):
+                for child in tree["children"]:
+                    traverse(child)
 
-        except Exception as e:
-            logger.error(f"Failed to analyze TypeScript file {file_path}: {e}", exc_info=True)
+        traverse(file_tree)
+        return code_files
 
-    def _analyze_c_file(self, file_path: str, content: str, repo_dir: str):
+    def extract_code_files_by_language(self, file_tree: Dict) -> Dict[str, List[Dict]]:
         """
-        Analyze C file using tree-sitter based analyzer.
+        Extract code files from file tree structure, grouped by language.
 
         Args:
-            file_path: Relative path to the C file
-            content: File content string
-            repo_dir: Repository base directory
-        """
-        from .analyzers.c import analyze_c_file
-
-        functions, relationships = analyze_c_file(file_path, content, repo_path=repo_dir)
-
-        for func in functions:
-            func_id = func.id if func.id else f"{file_path}:{func.name}"
-            self.functions[func_id] = func
-
-        self.call_relationships.extend(relationships)
+            file_tree: Nested dictionary representing file structure
 
-    def _analyze_cpp_file(self, file_path: str, content: str, repo_dir: str):
+        Returns:
+            Dict mapping language to its code file information dictionaries,
+            each list in file tree order
+        """
+        code_files_by_language: Dict[str, List[Dict]] = {}
+        for file_info in self.extract_code_files(file_tree):
+            code_files_by_language.setdefault(file_info["language"], []).append(file_info)
+        return code_files_by_language
+
+    def _add_file_results(
+        self, file_path: Path, functions: List[Node], relationships: List[CallRelationship]
+    ):
         """
-        Analyze C++ file using tree-sitter based analyzer.
+        Merge the functions and relationships found in one file.
 
         Args:
-            file_path: Relative path to the C++ file
-            content: File content string
+            file_path: Path to the analyzed file
+            functions: Functions found in the file
+            relationships: Call relationships found in the file
         """
-        from .analyzers.cpp import analyze_cpp_file
-
-        functions, relationships = analyze_cpp_file(
-            file_path, content, repo_path=repo_dir
-        )
-
         for func in functions:
             func_id = func.id if func.id else f"{file_path}:{func.name}"
             self.functions[func_id] = func
 
         self.call_relationships.extend(relationships)
 
-    def _analyze_java_file(self, file_path: str, content: str, repo_dir: str):
-        """
-        Analyze Java file using tree-sitter based analyzer.
-
-        Args:
-            file_path: Relative path to the Java file
-            content: File content string
-            repo_dir: Repository base directory
-        """
-        from .analyzers.java import analyze_java_file
-
-        try:
-            functions, relationships = analyze_java_file(file_path, content, repo_path=repo_dir)
-            for func in functions:
-                func_id = func.id if func.id else f"{file_path}:{func.name}"
-                self.functions[func_id] = func
-
-            self.call_relationships.extend(relationships)
-        except Exception as e:
-            logger.error(f"Failed to analyze Java file {file_path}: {e}", exc_info=True)
-
-    def _analyze_csharp_file(self, file_path: str, content: str, repo_dir: str):
-        """
-        Analyze C# file using tree-sitter based analyzer.
-
-        Args:
-            file_path: Relative path to the C# file
-            content: File content string
-            repo_dir: Repository base directory
-        """
-        from .analyzers.csharp import analyze_csharp_file
-
-        try:
-            functions, relationships = analyze_csharp_file(file_path, content, repo_path=repo_dir)
-
-            for func in functions:
-                func_id = func.id if func.id else f"{file_path}:{func.name}"
-                self.functions[func_id] = func
-
-            self.call_relationships.extend(relationships)
-        except Exception as e:
-            logger.error(f"Failed to analyze C# file {file_path}: {e}", exc_info=True)
-
-    def _analyze_php_file(self, file_path: str, content: str, repo_dir: str):
-        """
-        Analyze PHP file using tree-sitter based analyzer.
-
-        Args:
-            file_path: Relative path to the PHP file
-            content: File content string
-            repo_dir: Repository base directory
-        """
-        from .analyzers.php import analyze_php_file
-
-        try:
-            functions, relationships = analyze_php_file(file_path, content, repo_path=repo_dir)
-
-            for func in functions:
-                func_id = func.id if func.id else f"{file_path}:{func.name}"
-                self.functions[func_id] = func
-
-            self.call_relationships.extend(relationships)
-        except Exception as e:
-            logger.error(f"Failed to analyze PHP file {file_path}: {e}", exc_info=True)
-
     def _resolve_call_relationships(self):
         """
         Resolve function call relationships across all languages.
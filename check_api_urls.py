@@ -2,31 +2,71 @@
 """
 Script to check api_url fields in results.json
 """
+import json
+import mmap
 import re
 
-def check_api_urls():
-    with open('D:\\ASTDATA\\results.json', 'r', encoding='utf-8') as f:
-        content = f.read()
+try:
+    # 可选依赖：有C后端的流式JSON解析器时按真正的JSON结构读取
+    import ijson
+except ImportError:
+    ijson = None
+
+# 与原先的文本模式相同，但直接在字节上匹配，无需解码整个文件
+API_URL_PATTERN = re.compile(rb'"api_url":\s*([^,\n}]*)')
+
+
+def _iter_api_urls_json(path):
+    """用ijson流式解析每个组件的api_url，null返回None，其余返回其JSON文本"""
+    with open(path, 'rb') as f:
+        for _, component in ijson.kvitems(f, 'components', use_float=True):
+            if isinstance(component, dict) and 'api_url' in component:
+                value = component['api_url']
+                yield None if value is None else json.dumps(value, ensure_ascii=False)
 
-    # 使用正则表达式快速扫描所有api_url字段
-    pattern = r'"api_url":\s*([^,\n}]*)'
-    matches = re.findall(pattern, content)
 
-    null_count = sum(1 for m in matches if m.strip() == 'null')
-    non_null_matches = [m.strip() for m in matches if m.strip() != 'null']
+def _iter_api_urls_regex(path):
+    """没有ijson时按文本模式扫描内存映射的文件，null返回None，其余返回匹配文本"""
+    with open(path, 'rb') as f:
+        # 空文件无法映射
+        if f.seek(0, 2) == 0:
+            return
+        # 内存映射文件并逐个扫描api_url字段，不读入整个文件也不保留匹配列表
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for m in API_URL_PATTERN.finditer(mm):
+                value = m.group(1).strip()
+                yield None if value == b'null' else value.decode('utf-8', 'replace')
+
+
+def check_api_urls():
+    total = 0
+    null_count = 0
+    non_null_count = 0
+    non_null_matches = []  # 只保留前10个用于显示
+
+    path = 'D:\\ASTDATA\\results.json'
+    api_urls = _iter_api_urls_json(path) if ijson is not None else _iter_api_urls_regex(path)
+    for value in api_urls:
+        total += 1
+        if value is None:
+            null_count += 1
+        else:
+            non_null_count += 1
+            if len(non_null_matches) < 10:
+                non_null_matches.append(value)
 
-    print(f'总共找到 {len(matches)} 个api_url字段')
+    print(f'总共找到 {total} 个api_url字段')
     print(f'其中为null的数量: {null_count}')
-    print(f'其中非null的数量: {len(non_null_matches)}')
+    print(f'其中非null的数量: {non_null_count}')
 
     if non_null_matches:
         print('\n非null的api_url值:')
-        for i, match in enumerate(non_null_matches[:10]):  # 只显示前10个
+        for i, match in enumerate(non_null_matches):  # 只显示前10个
             print(f"{i+1}. {match}")
-        if len(non_null_matches) > 10:
-            print(f"... 还有 {len(non_null_matches) - 10} 个")
+        if non_null_count > 10:
+            print(f"... 还有 {non_null_count - 10} 个")
     else:
         print('\n没有找到非null的api_url值')
 
 if __name__ == "__main__":
-    check_api_urls()
\ No newline at end of file
+    check_api_urls()
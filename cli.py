@@ -8,16 +8,21 @@ import sys
 import json
 import argparse
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+from .utils.cache import DEFAULT_CACHE_DIR
 
-def analyze_repository(repo_path: str, output_path: str = None) -> Dict[Any, Any]:
+
+def analyze_repository(repo_path: str, output_path: str = None, max_workers: Optional[int] = 1,
+                       cache_dir: str = None) -> Dict[Any, Any]:
     """
     Analyze a repository and generate a call graph.
     
     Args:
         repo_path: Path to the repository to analyze
         output_path: Optional path to save the results (JSON format)
+        max_workers: Number of worker processes (1 analyzes files in this process, 0 or None uses the CPU count)
+        cache_dir: Optional directory for cached per-file results (disabled by default)
         
     Returns:
         Dictionary containing analysis results
@@ -28,7 +33,7 @@ def analyze_repository(repo_path: str, output_path: str = None) -> Dict[Any, Any
     print(f"Analyzing repository: {repo_path}")
     
     # Initialize the dependency graph builder
-    builder = DependencyGraphBuilder(repo_path)
+    builder = DependencyGraphBuilder(repo_path, max_workers=max_workers, cache_dir=cache_dir)
     
     # Build the dependency graph
     components, leaf_nodes = builder.build_dependency_graph()
@@ -491,6 +496,12 @@ Examples:
     analyze_parser = subparsers.add_parser('analyze', help='Analyze a repository for call graphs')
     analyze_parser.add_argument('repo_path', help='Path to the repository to analyze')
     analyze_parser.add_argument('-o', '--output', help='Output file path for results (JSON format)')
+    analyze_parser.add_argument('-j', '--workers', type=int, default=1,
+                                help='Number of worker processes used to analyze files '
+                                     '(default: 1, analyzing in this process; 0 uses every CPU)')
+    analyze_parser.add_argument('--cache-dir', nargs='?', const=DEFAULT_CACHE_DIR, default=None,
+                                help='Reuse results for unchanged files from a cache in this directory '
+                                     f'(default when given without a value: {DEFAULT_CACHE_DIR})')
     
     # Visualize command
     visualize_parser = subparsers.add_parser('visualize', help='Visualize analysis results')
@@ -522,7 +533,7 @@ Examples:
     
     if args.command == 'analyze':
         try:
-            results = analyze_repository(args.repo_path, args.output)
+            results = analyze_repository(args.repo_path, args.output, args.workers, args.cache_dir)
             print("Analysis completed successfully!")
         except Exception as e:
             print(f"Error during analysis: {e}", file=sys.stderr)
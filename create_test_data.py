@@ -31,7 +31,7 @@ public class RAGService {
     for node in nodes:
         if node.component_type == 'method' and node.api_url:
             print(f'Method: {node.name}, API URL: {node.api_url}, HTTP Method: {node.http_method}')
-            print(f'Source Code: {repr(node.source_code[:100])}...')
+            print(f'Source Code: {repr(node.get_source()[:100])}...')
 
     # 构建模拟的依赖图
     components = {}
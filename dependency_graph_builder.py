@@ -6,7 +6,7 @@ Handles dependency analysis and graph building for call graph generation.
 
 import os
 import json
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
 
 from .analysis_service import CallGraphAnalysisService
@@ -16,9 +16,9 @@ from .models import Node
 class DependencyGraphBuilder:
     """Handles dependency analysis and graph building for call graph generation."""
     
-    def __init__(self, repo_path: str):
+    def __init__(self, repo_path: str, max_workers: Optional[int] = 1, cache_dir: Optional[str] = None):
         self.repo_path = repo_path
-        self.analysis_service = CallGraphAnalysisService()
+        self.analysis_service = CallGraphAnalysisService(max_workers=max_workers, cache_dir=cache_dir)
     
     def build_dependency_graph(self) -> Tuple[Dict[str, Any], List[str]]:
         """
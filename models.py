@@ -2,14 +2,22 @@
 Core models for call graph analysis.
 """
 
-from typing import List, Optional, Set, Dict, Any
+from typing import List, Optional, Set, Dict, Any, Tuple
 from dataclasses import dataclass, field
 import json
 
-@dataclass
+@dataclass(slots=True)
 class Node:
-    """Represents a code component (function, class, method, etc.) in the call graph."""
-    
+    """
+    Represents a code component (function, class, method, etc.) in the call graph.
+
+    Read the source code with get_source() or model_dump(), not the
+    source_code field. The C#, Java and PHP analyzers only record where the
+    source lies in the file (set_source_span), and source_code stays empty
+    until get_source() decodes it; the other analyzers fill it in directly.
+    Pickling a node decodes its source first.
+    """
+
     id: str = ""
     name: str = ""
     component_type: str = "function"  # function, method, class, interface, etc.
@@ -29,6 +37,39 @@ class Node:
     depends_on: Set[str] = field(default_factory=set)  # IDs of components this node calls
     api_url: Optional[str] = None  # For controller methods with API mapping annotations
     http_method: Optional[str] = None  # For controller methods, stores HTTP method (GET, POST, etc.)
+    # Private: (content bytes, start byte, end byte) of the source code not yet
+    # decoded, set by set_source_span and cleared by get_source. Kept out of
+    # __init__, repr and comparisons.
+    _source_span: Optional[Tuple[bytes, int, int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def set_source_span(self, content_bytes: bytes, start_byte: int, end_byte: int) -> None:
+        """Take the source code from a byte range of the file, decoded by get_source on first use."""
+        self._source_span = (content_bytes, start_byte, end_byte)
+
+    def get_source(self) -> str:
+        """
+        Get the source code of the component.
+
+        A span set with set_source_span is decoded into source_code here, so
+        source_code itself is only filled in once this has been called.
+        """
+        span = self._source_span
+        if span is not None:
+            content_bytes, start_byte, end_byte = span
+            self.source_code = content_bytes[start_byte:end_byte].decode("utf8")
+            self._source_span = None
+        return self.source_code
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        # Decode first so the whole file's bytes are not pickled with every node
+        self.get_source()
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
     
     def model_dump(self) -> Dict[str, Any]:
         """Convert the node to a dictionary representation."""
@@ -38,7 +79,7 @@ class Node:
             "component_type": self.component_type,
             "file_path": self.file_path,
             "relative_path": self.relative_path,
-            "source_code": self.source_code,
+            "source_code": self.get_source(),
             "start_line": self.start_line,
             "end_line": self.end_line,
             "has_docstring": self.has_docstring,
@@ -55,7 +96,7 @@ class Node:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class CallRelationship:
     """Represents a call relationship between two functions."""
     
@@ -2,8 +2,9 @@
 Setup script for initializing tree-sitter parsers for the call graph analyzer.
 """
 import os
+import threading
 from pathlib import Path
-from tree_sitter import Language
+from tree_sitter import Language, Parser
 
 
 def setup_parsers():
@@ -91,4 +92,42 @@ def get_parser(language: str):
     Returns:
         Language parser object or None if not available
     """
-    return PARSERS.get(language)
\ No newline at end of file
+    return PARSERS.get(language)
+
+
+# Parser objects are not thread-safe, so each thread keeps its own per language.
+_thread_state = threading.local()
+
+
+def get_cached_parser(language: str):
+    """
+    Get a tree-sitter Parser for the specified language, reused across files.
+
+    Language objects are built once at import time and shared; Parser objects are
+    cached per thread so analyzers do not construct a new one for every file.
+    
+    Args:
+        language: Programming language name
+        
+    Returns:
+        Parser object bound to the language, or None if the language is not available
+    """
+    parsers = getattr(_thread_state, "parsers", None)
+    if parsers is None:
+        parsers = _thread_state.parsers = {}
+
+    parser = parsers.get(language)
+    if parser is None:
+        language_obj = get_parser(language)
+        if language_obj is None:
+            return None
+
+        parser = Parser()
+        try:
+            # Try the newer API first (tree-sitter>=0.20.0)
+            parser.set_language(language_obj)
+        except AttributeError:
+            # Fallback to older API if needed
+            parser.language = language_obj
+        parsers[language] = parser
+    return parser
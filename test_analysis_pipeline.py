@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that parallel, cached and async analysis give the same call graph as serial analysis
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import pickle
+import time
+from pathlib import Path
+
+# 将当前目录添加到系统路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import callgraph_analyzer.call_graph_analyzer as call_graph_analyzer
+from callgraph_analyzer.analysis_service import CallGraphAnalysisService
+from callgraph_analyzer.analyzers.csharp import analyze_csharp_file
+from callgraph_analyzer.models import Node
+from callgraph_analyzer.utils.cache import AnalysisCache, file_digest, file_stamp
+from callgraph_analyzer.utils.parallel import map_in_processes
+
+# 测试用的小型多语言仓库
+REPO_FILES = {
+    "app/main.py": """
+def helper(x):
+    return x + 1
+
+def run():
+    return helper(2)
+""",
+    "src/Ctl.java": """
+@RestController
+@RequestMapping("/api")
+public class Ctl {
+    private Svc svc;
+
+    @GetMapping("/items")
+    public String list() {
+        return svc.load();
+    }
+}
+""",
+    "src/Svc.cs": """
+public class Svc {
+    public string Load() { return Format("x"); }
+    public string Format(string s) { return s; }
+}
+""",
+    "src/lib.php": """<?php
+function helper($a) { return later($a); }
+function later($a) { return $a; }
+class Box {
+    public function open() { return helper(1); }
+}
+""",
+    "src/shapes.cpp": """
+int area(int w, int h) { return w * h; }
+int total() { return area(1, 2) + area(3, 4); }
+""",
+    # 没有任何组件的文件，分析结果为空
+    "app/settings.py": """
+DEBUG = True
+""",
+}
+
+
+def _make_repo():
+    repo = tempfile.mkdtemp()
+    for rel_path, content in REPO_FILES.items():
+        path = os.path.join(repo, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+    return repo
+
+
+def _comparable(result):
+    # 时间戳每次运行都不同，比较时忽略
+    summary = dict(result["summary"])
+    summary.pop("analysis_timestamp", None)
+    return {**result, "summary": summary}
+
+
+def _count_analyzed_files(analyzed):
+    """Wrap analyze_code_content so that the paths it analyzes are appended to analyzed."""
+    original = call_graph_analyzer.analyze_code_content
+
+    def counting(repo_dir, file_info, content):
+        analyzed.append(file_info["path"])
+        return original(repo_dir, file_info, content)
+
+    call_graph_analyzer.analyze_code_content = counting
+    return original
+
+
+def _square(x):
+    return x * x
+
+
+def test_map_in_processes_preserves_order():
+    items = list(range(50))
+    assert map_in_processes(_square, items, max_workers=1) == [x * x for x in items]
+    assert map_in_processes(_square, items, max_workers=4, chunksize=3) == [x * x for x in items]
+
+
+def test_parallel_matches_serial():
+    repo = _make_repo()
+    try:
+        serial = CallGraphAnalysisService(max_workers=1).analyze_repository(repo)
+        # 默认在当前进程中分析
+        default = CallGraphAnalysisService().analyze_repository(repo)
+        all_cpus = CallGraphAnalysisService(max_workers=None).analyze_repository(repo)
+        # 显式使用两个进程，保证单核机器上也走进程池
+        parallel = CallGraphAnalysisService(max_workers=2).analyze_repository(repo)
+
+        assert CallGraphAnalysisService().call_graph_analyzer.max_workers == 1
+        assert serial["functions"], "no functions found"
+        assert serial["relationships"], "no relationships found"
+        assert _comparable(serial) == _comparable(default)
+        assert _comparable(serial) == _comparable(all_cpus)
+        assert _comparable(serial) == _comparable(parallel)
+    finally:
+        shutil.rmtree(repo)
+
+
+def test_cache_hit_miss_and_invalidation():
+    cache_dir = tempfile.mkdtemp()
+    repo = _make_repo()
+    try:
+        path = os.path.join(repo, "app", "main.py")
+        stamp = file_stamp(path)
+        digest = file_digest(path)
+        result = (["nodes"], ["relationships"])
+
+        cache = AnalysisCache(cache_dir)
+        assert cache.get(repo, path, stamp) is None
+        cache.put(repo, path, stamp, result)
+        cache.put_by_content(repo, Path(path), digest, result)
+        cache.close()
+
+        cache = AnalysisCache(cache_dir)
+        assert cache.get(repo, path, stamp) == result
+        # 文件变化后按时间戳和大小失效
+        assert cache.get(repo, path, (stamp[0] + 1, stamp[1])) is None
+        # 内容摘要相同则仍然命中，接受Path类型的路径
+        assert cache.get_by_content(repo, Path(path), digest) == result
+        assert cache.get_by_content(repo, path, b"0" * 32) is None
+        cache.close()
+
+        # 分析器代码变化后（指纹不同）不再命中
+        cache = AnalysisCache(cache_dir)
+        cache._fingerprint = "other analyzer code"
+        assert cache.get(repo, path, stamp) is None
+        assert cache.get_by_content(repo, path, digest) is None
+        cache.close()
+    finally:
+        shutil.rmtree(repo)
+        shutil.rmtree(cache_dir)
+
+
+def test_cold_and_warm_cache_match():
+    cache_dir = tempfile.mkdtemp()
+    repo = _make_repo()
+    analyzed = []
+    original = _count_analyzed_files(analyzed)
+    try:
+        uncached = CallGraphAnalysisService(max_workers=1).analyze_repository(repo)
+        analyzed.clear()
+        cold = CallGraphAnalysisService(max_workers=1, cache_dir=cache_dir).analyze_repository(repo)
+        assert len(analyzed) == len(REPO_FILES)
+
+        analyzed.clear()
+        warm = CallGraphAnalysisService(max_workers=1, cache_dir=cache_dir).analyze_repository(repo)
+        # 结果为空的文件同样命中缓存
+        assert analyzed == []
+        assert _comparable(uncached) == _comparable(cold) == _comparable(warm)
+
+        # 只修改时间戳时按内容摘要命中
+        touched = os.path.join(repo, "src", "lib.php")
+        later = time.time_ns() + 10 ** 9
+        os.utime(touched, ns=(later, later))
+        analyzed.clear()
+        retouched = CallGraphAnalysisService(max_workers=1, cache_dir=cache_dir).analyze_repository(repo)
+        assert analyzed == []
+        # 文件树中包含修改时间，因此只比较调用图
+        assert retouched["functions"] == uncached["functions"]
+        assert retouched["relationships"] == uncached["relationships"]
+
+        # 修改内容后重新分析该文件
+        with open(os.path.join(repo, "app", "main.py"), "a", encoding="utf-8") as f:
+            f.write("\ndef extra():\n    return run()\n")
+        analyzed.clear()
+        changed = CallGraphAnalysisService(max_workers=1, cache_dir=cache_dir).analyze_repository(repo)
+        assert analyzed == [os.path.join(repo, "app", "main.py")]
+        assert "app.main.extra" in {func["id"] for func in changed["functions"]}
+    finally:
+        call_graph_analyzer.analyze_code_content = original
+        shutil.rmtree(repo)
+        shutil.rmtree(cache_dir)
+
+
+def test_async_matches_sync():
+    cache_dir = tempfile.mkdtemp()
+    repo = _make_repo()
+    try:
+        sync_result = CallGraphAnalysisService(max_workers=1).analyze_repository(repo)
+        async_result = asyncio.run(
+            CallGraphAnalysisService().analyze_repository_async(repo, batch_size=2)
+        )
+        assert _comparable(sync_result) == _comparable(async_result)
+
+        # 异步路径同样读写缓存
+        service = CallGraphAnalysisService(cache_dir=cache_dir)
+        cold = asyncio.run(service.analyze_repository_async(repo, batch_size=2))
+        warm = asyncio.run(service.analyze_repository_async(repo, batch_size=2))
+        assert _comparable(sync_result) == _comparable(cold) == _comparable(warm)
+    finally:
+        shutil.rmtree(repo)
+        shutil.rmtree(cache_dir)
+
+
+def test_code_files_keep_file_tree_order():
+    def file_node(path):
+        name = path.rsplit("/", 1)[-1]
+        return {"type": "file", "path": path, "name": name, "extension": "." + name.rsplit(".", 1)[-1]}
+
+    file_tree = {"type": "directory", "children": [
+        file_node("b.php"),
+        {"type": "directory", "children": [file_node("src/a.py"), file_node("src/c.php")]},
+        file_node("notes.txt"),
+        file_node("z.py"),
+    ]}
+    analyzer = call_graph_analyzer.CallGraphAnalyzer()
+
+    # 列表按文件树顺序返回，不按语言分组
+    assert [f["path"] for f in analyzer.extract_code_files(file_tree)] == ["b.php", "src/a.py", "src/c.php", "z.py"]
+    grouped = analyzer.extract_code_files_by_language(file_tree)
+    assert {language: [f["path"] for f in files] for language, files in grouped.items()} == {
+        "php": ["b.php", "src/c.php"],
+        "python": ["src/a.py", "z.py"],
+    }
+
+
+def test_lazy_source_code():
+    content = "int main() {}\nint helper() { return 1; }\n".encode("utf8")
+    start = content.index(b"int helper")
+    node = Node(id="helper")
+    node.set_source_span(content, start, len(content) - 1)
+
+    # 序列化前先解码，避免每个节点都带上整个文件的字节
+    restored = pickle.loads(pickle.dumps(node))
+    assert restored._source_span is None
+    assert restored.source_code == "int helper() { return 1; }"
+
+    assert node.get_source() == "int helper() { return 1; }"
+    assert node.model_dump()["source_code"] == node.source_code
+    assert Node(source_code="x").get_source() == "x"
+
+
+def test_csharp_query_extraction():
+    # C#分析器通过编译好的查询提取声明和调用，结果与原先逐节点遍历一致
+    csharp_content = """public class Base {}
+public class Svc : Base {
+    public string Load() { var h = new Helper(); return Format("x"); }
+    public string Format(string s) { return s; }
+}
+public interface IRepo { void Save(); }
+"""
+    nodes, relationships = analyze_csharp_file("/repo/src/Svc.cs", csharp_content, "/repo")
+
+    assert [(node.id, node.component_type) for node in nodes] == [
+        ("src.Svc.Base", "class"),
+        ("src.Svc.Svc", "class"),
+        ("src.Svc.IRepo", "interface"),
+        ("src.Svc.Save", "method"),
+    ]
+    assert [(rel.caller, rel.callee, rel.call_line) for rel in relationships] == [
+        ("src.Svc.Svc", "src.Svc.Base", 2),
+        ("src.Svc.Load", "src.Svc.Helper", 3),
+        ("src.Svc.Load", "src.Svc.Format", 3),
+    ]
+
+
+if __name__ == "__main__":
+    test_map_in_processes_preserves_order()
+    test_parallel_matches_serial()
+    test_cache_hit_miss_and_invalidation()
+    test_cold_and_warm_cache_match()
+    test_async_matches_sync()
+    test_code_files_keep_file_tree_order()
+    test_lazy_source_code()
+    test_csharp_query_extraction()
+    print("OK")
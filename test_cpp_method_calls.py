@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that calls to C++ methods defined in a class body are resolved
+"""
+import sys
+import os
+
+# 将当前目录添加到系统路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from callgraph_analyzer.analyzers.cpp import analyze_cpp_file
+
+
+def test_in_class_method_calls_are_resolved():
+    # 类体内定义的方法用field_identifier命名，对它们的调用也应视为已解析
+    cpp_content = """class Counter {
+public:
+    Counter() { reset(); }
+    int get() { return value; }
+    void reset() { value = 0; }
+private:
+    int value;
+};
+
+int run() {
+    Counter c;
+    return c.get();
+}
+"""
+    nodes, relationships = analyze_cpp_file("/repo/src/counter.cpp", cpp_content, "/repo")
+
+    # 类体内的方法不作为节点输出
+    assert not {"get", "reset"} & {node.name for node in nodes}
+    assert [(rel.caller, rel.callee, rel.call_line, rel.is_resolved) for rel in relationships] == [
+        ("src.counter.Counter", "src.counter.reset", 3, True),
+        ("src.counter.run", "src.counter.get", 12, True),
+    ]
+
+    # 未在本文件中定义的方法仍然未解析
+    _, relationships = analyze_cpp_file("/repo/src/other.cpp", "int run(Counter c) { return c.get(); }\n", "/repo")
+    assert [(rel.callee, rel.is_resolved) for rel in relationships] == [("src.other.get", False)]
+
+
+if __name__ == "__main__":
+    test_in_class_method_calls_are_resolved()
+    print("OK")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script to verify abstract class detection and RequestMapping method arguments
+"""
+import sys
+import os
+
+# 将当前目录添加到系统路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from callgraph_analyzer.analyzers.java import analyze_java_file
+
+
+def test_abstract_class():
+    java_content = """public abstract class BaseController {
+    protected abstract String name();
+}
+
+public final class UserController extends BaseController {
+    protected String name() { return "user"; }
+}
+"""
+    nodes, relationships = analyze_java_file('test.java', java_content)
+
+    classes = {node.name: node for node in nodes if node.component_type in ("class", "abstract class")}
+    assert classes["BaseController"].component_type == "abstract class"
+    assert classes["BaseController"].display_name == "abstract class BaseController"
+    # 其他修饰符不影响类的类型
+    assert classes["UserController"].component_type == "class"
+
+
+def test_request_mapping_method_argument():
+    # RequestMapping的method参数可以是字段访问、数组或静态导入的标识符
+    java_content = """@RestController
+@RequestMapping("/api")
+public class ItemController {
+
+    @RequestMapping(value = "/items", method = RequestMethod.PUT)
+    public String update() { return ""; }
+
+    @RequestMapping(value = "/items", method = {RequestMethod.POST, RequestMethod.PUT})
+    public String create() { return ""; }
+
+    @RequestMapping(value = "/items/{id}", method = DELETE)
+    public String delete() { return ""; }
+
+    @RequestMapping("/items")
+    public String list() { return ""; }
+}"""
+    nodes, relationships = analyze_java_file('test.java', java_content)
+
+    methods = {node.id.rsplit(".", 1)[-1]: node for node in nodes if node.component_type == "method"}
+    assert (methods["update"].api_url, methods["update"].http_method) == ("/api/items", "PUT")
+    # 数组取第一个方法
+    assert (methods["create"].api_url, methods["create"].http_method) == ("/api/items", "POST")
+    assert (methods["delete"].api_url, methods["delete"].http_method) == ("/api/items/{id}", "DELETE")
+    # 未指定method时默认为GET
+    assert (methods["list"].api_url, methods["list"].http_method) == ("/api/items", "GET")
+
+
+if __name__ == "__main__":
+    test_abstract_class()
+    test_request_mapping_method_argument()
+    print("OK")
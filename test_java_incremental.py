@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that incremental Java re-analysis gives the same result as a full parse
+"""
+import sys
+import os
+
+# 将当前目录添加到系统路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from callgraph_analyzer.analyzers import java
+from callgraph_analyzer.analyzers.java import (
+    TreeSitterJavaAnalyzer,
+    analyze_java_file,
+    analyze_java_file_incremental,
+)
+
+ORIGINAL = """@RestController
+@RequestMapping("/api")
+public class ItemController {
+    private ItemService itemService;
+
+    @GetMapping("/items")
+    public String list() {
+        return itemService.findAll();
+    }
+}
+"""
+
+# 依次对同一文件做的修改：在中间插入、删除、修改开头、整体替换以及不修改
+EDITED_VERSIONS = [
+    ORIGINAL.replace(
+        "    }\n}\n",
+        "    }\n\n    @PostMapping(\"/items\")\n    public String create() {\n        return itemService.save();\n    }\n}\n",
+    ),
+    ORIGINAL.replace("        return itemService.findAll();\n", ""),
+    ORIGINAL.replace('"/api"', '"/api/v2"'),
+    "public class Other {\n    void run() { helper(); }\n    void helper() {}\n}\n",
+    "public class Other {\n    void run() { helper(); }\n    void helper() {}\n}\n",
+    ORIGINAL,
+]
+
+
+def _dump(result):
+    nodes, relationships = result
+    return [node.model_dump() for node in nodes], relationships
+
+
+def test_incremental_matches_full_parse():
+    file_path = "/repo/src/ItemController.java"
+    assert _dump(analyze_java_file_incremental(file_path, ORIGINAL, "/repo")) == _dump(
+        analyze_java_file(file_path, ORIGINAL, "/repo")
+    )
+
+    analyze_java_file_incremental(file_path, ORIGINAL, "/repo")
+    for content in EDITED_VERSIONS:
+        # 保留的语法树经过编辑后复用，结果必须与完整解析一致
+        assert os.path.abspath(file_path) in java._tree_cache
+        incremental = analyze_java_file_incremental(file_path, content, "/repo")
+        full = TreeSitterJavaAnalyzer(file_path, content, "/repo")
+        assert _dump(incremental) == _dump((full.nodes, full.call_relationships))
+        assert str(java._tree_cache[os.path.abspath(file_path)][1].root_node) == str(full.root_node)
+
+    # 完整解析会丢弃保留的语法树
+    analyze_java_file(file_path, ORIGINAL, "/repo")
+    assert os.path.abspath(file_path) not in java._tree_cache
+
+
+def test_compute_edit():
+    old = "a\nbc\nd".encode("utf8")
+    new = "a\nbXYc\nd".encode("utf8")
+    assert java._compute_edit(old, old) is None
+    assert java._compute_edit(old, new) == {
+        "start_byte": 3,
+        "old_end_byte": 3,
+        "new_end_byte": 5,
+        "start_point": (1, 1),
+        "old_end_point": (1, 1),
+        "new_end_point": (1, 3),
+    }
+    # 重复的字符不会让公共前缀与后缀重叠
+    edit = java._compute_edit(b"aaa", b"aaaa")
+    assert (edit["start_byte"], edit["old_end_byte"], edit["new_end_byte"]) == (3, 3, 4)
+
+
+if __name__ == "__main__":
+    test_incremental_matches_full_parse()
+    test_compute_edit()
+    print("OK")
@@ -0,0 +1,265 @@
+"""
+Persistent cache of per-file analysis results.
+"""
+
+import functools
+import hashlib
+import importlib.metadata
+import logging
+import os
+import pickle
+import sqlite3
+import zlib
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Default location for the cache database when the caller does not pick one.
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "callgraph_analyzer")
+
+# Bump when the layout of the cache tables changes so old databases are dropped.
+# Changes to the analyzers are picked up by analyzer_fingerprint instead.
+CACHE_VERSION = 4
+
+# Package modules whose code determines the per-file results, relative to the
+# package directory, and the installed parser packages that do the same.
+_ANALYZER_SOURCES = ("analyzers", "models.py", "setup_parser.py", "call_graph_analyzer.py")
+_PARSER_DISTRIBUTIONS = (
+    "tree-sitter", "tree-sitter-python", "tree-sitter-javascript", "tree-sitter-typescript",
+    "tree-sitter-java", "tree-sitter-c-sharp", "tree-sitter-c", "tree-sitter-cpp", "tree-sitter-php",
+)
+
+# Results are mostly source snippets and repeated IDs, which compress several
+# times over; the fastest zlib level keeps the cost well below a re-parse.
+_COMPRESS_LEVEL = 1
+
+FileStamp = Tuple[int, int]
+
+
+def file_stamp(file_path: Union[str, Path]) -> Optional[FileStamp]:
+    """
+    Get the (mtime_ns, size) pair used to detect whether a file has changed.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Tuple of (mtime_ns, size), or None if the file cannot be stat'ed
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_digest(file_path: Union[str, Path]) -> Optional[bytes]:
+    """
+    Get the SHA-256 digest identifying a file's content.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        32-byte digest of the file's bytes, or None if the file cannot be read
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.digest()
+
+
+@functools.lru_cache(maxsize=None)
+def analyzer_fingerprint() -> str:
+    """
+    Get a digest identifying the code that produces the cached results.
+
+    It covers the source of the analyzer modules and the versions of the
+    installed tree-sitter packages, so entries written by any other version
+    of either are never returned.
+
+    Returns:
+        str: Hex digest, computed once per process
+    """
+    package_dir = Path(__file__).resolve().parent.parent
+    digest = hashlib.sha256()
+    for name in _ANALYZER_SOURCES:
+        path = package_dir / name
+        for source in sorted(path.rglob("*.py")) if path.is_dir() else [path]:
+            digest.update(source.relative_to(package_dir).as_posix().encode())
+            try:
+                digest.update(source.read_bytes())
+            except OSError:
+                pass
+    for distribution in _PARSER_DISTRIBUTIONS:
+        try:
+            version = importlib.metadata.version(distribution)
+        except importlib.metadata.PackageNotFoundError:
+            version = ""
+        digest.update(f"{distribution}={version}".encode())
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    SQLite-backed cache mapping analyzed files to their pickled, compressed results.
+
+    Entries are keyed by repository and file path and are only returned while
+    the file's modification time and size still match, so unchanged files are
+    not read or parsed again on a warm re-run. Entries can also be keyed by a
+    digest of the content, which survives checkouts and other writes that
+    change the stamp but leave the content unchanged. Either way an entry is
+    only returned while its analyzer_fingerprint matches the running code.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path, None] = None):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            cache_dir: Directory holding the cache database, or None for DEFAULT_CACHE_DIR
+        """
+        cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR).expanduser()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = cache_dir / "analysis.sqlite3"
+        self._fingerprint = analyzer_fingerprint()
+
+        self._conn = sqlite3.connect(str(self.db_path))
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != CACHE_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS file_results")
+            self._conn.execute("DROP TABLE IF EXISTS content_results")
+            self._conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS file_results (
+                repo_path TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                analyzer TEXT NOT NULL,
+                result BLOB NOT NULL,
+                PRIMARY KEY (repo_path, file_path)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS content_results (
+                repo_path TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                content_hash BLOB NOT NULL,
+                analyzer TEXT NOT NULL,
+                result BLOB NOT NULL,
+                PRIMARY KEY (repo_path, file_path)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, repo_path: str, file_path: Union[str, Path], stamp: Optional[FileStamp]) -> Optional[Any]:
+        """
+        Look up the cached result for a file.
+
+        Args:
+            repo_path: Repository directory the file was analyzed in
+            file_path: Path of the analyzed file
+            stamp: Current file stamp from file_stamp()
+
+        Returns:
+            The cached result, or None on a miss, if the file has changed or if
+            the entry was written by other analyzer code
+        """
+        if stamp is None:
+            return None
+
+        row = self._conn.execute(
+            "SELECT mtime_ns, size, analyzer, result FROM file_results WHERE repo_path = ? AND file_path = ?",
+            (repo_path, str(file_path)),
+        ).fetchone()
+        if row is None or (row[0], row[1]) != stamp or row[2] != self._fingerprint:
+            return None
+        return self._load(row[3], file_path)
+
+    def put(self, repo_path: str, file_path: Union[str, Path], stamp: Optional[FileStamp], result: Any) -> None:
+        """
+        Store the result for a file.
+
+        The stamp should be taken before the file is read so that an edit made
+        during analysis invalidates the entry instead of being masked by it.
+
+        Args:
+            repo_path: Repository directory the file was analyzed in
+            file_path: Path of the analyzed file
+            stamp: File stamp from file_stamp(), taken before analysis
+            result: Picklable analysis result
+        """
+        if stamp is None:
+            return
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO file_results VALUES (?, ?, ?, ?, ?, ?)",
+            (repo_path, str(file_path), stamp[0], stamp[1], self._fingerprint, self._dump(result)),
+        )
+
+    def get_by_content(self, repo_path: str, file_path: Union[str, Path], digest: bytes) -> Optional[Any]:
+        """
+        Look up the cached result for a file with the given content.
+
+        Args:
+            repo_path: Repository directory the file was analyzed in
+            file_path: Path of the analyzed file
+            digest: Content digest from file_digest()
+
+        Returns:
+            The cached result, or None on a miss, if the content has changed or
+            if the entry was written by other analyzer code
+        """
+        row = self._conn.execute(
+            "SELECT content_hash, analyzer, result FROM content_results WHERE repo_path = ? AND file_path = ?",
+            (repo_path, str(file_path)),
+        ).fetchone()
+        if row is None or row[0] != digest or row[1] != self._fingerprint:
+            return None
+        return self._load(row[2], file_path)
+
+    def put_by_content(self, repo_path: str, file_path: Union[str, Path], digest: bytes, result: Any) -> None:
+        """
+        Store the result for a file with the given content.
+
+        Args:
+            repo_path: Repository directory the file was analyzed in
+            file_path: Path of the analyzed file
+            digest: Content digest from file_digest()
+            result: Picklable analysis result
+        """
+        self._conn.execute(
+            "INSERT OR REPLACE INTO content_results VALUES (?, ?, ?, ?, ?)",
+            (repo_path, str(file_path), digest, self._fingerprint, self._dump(result)),
+        )
+
+    @staticmethod
+    def _dump(result: Any) -> bytes:
+        return zlib.compress(pickle.dumps(result, pickle.HIGHEST_PROTOCOL), _COMPRESS_LEVEL)
+
+    @staticmethod
+    def _load(payload: bytes, file_path: str) -> Optional[Any]:
+        try:
+            return pickle.loads(zlib.decompress(payload))
+        except Exception as e:
+            logger.debug(f"Discarding unreadable cache entry for {file_path}: {e}")
+            return None
+
+    def commit(self) -> None:
+        """Write pending entries to disk."""
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Commit pending entries and close the database."""
+        self._conn.commit()
+        self._conn.close()
@@ -0,0 +1,58 @@
+"""
+Process pool helpers for analyzing many files in parallel.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def resolve_worker_count(max_workers: Optional[int] = None) -> int:
+    """
+    Get the number of worker processes to use.
+
+    Args:
+        max_workers: Requested number of workers, or None (or 0) to use every CPU
+
+    Returns:
+        int: Number of workers, at least 1
+    """
+    return max(1, max_workers or os.cpu_count() or 1)
+
+
+def map_in_processes(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> List[R]:
+    """
+    Apply a function to every item across a process pool, preserving order.
+
+    Per-file analysis is CPU-bound Python work that holds the GIL, so processes
+    are used rather than threads. The work runs in-process when a single worker
+    is requested or there is at most one item, avoiding the pool startup cost.
+
+    Args:
+        func: Picklable (module-level) function to apply
+        items: Picklable work items
+        max_workers: Number of worker processes, or None to use every CPU
+        chunksize: Items sent to a worker per task; by default the items are
+            split into about four chunks per worker to amortize IPC overhead
+
+    Returns:
+        List of results in the same order as items
+    """
+    items = list(items)
+    workers = min(resolve_worker_count(max_workers), len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+
+    if chunksize is None:
+        chunksize = max(1, len(items) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))